@@ -4,9 +4,9 @@ FastAPI dependencies for authentication and authorization.
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, Dict, Any
 from app.core.database import get_supabase_client
-from app.core.security import verify_token
+from app.core.security import verify_token_cached
 from app.services.auth_service import AuthService
 from supabase import Client
 
@@ -15,12 +15,33 @@ from supabase import Client
 security = HTTPBearer()
 
 
-def get_auth_service(
+async def get_auth_service(
     supabase_client: Client = Depends(get_supabase_client)
 ) -> AuthService:
     return AuthService(supabase_client)
 
 
+async def get_current_token_payload(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> Dict[str, Any]:
+    """
+    Dependency to get the full verified token payload.
+
+    For routes that need more claims than the user id (e.g. email), so
+    the token is decoded exactly once per request.
+    """
+    payload = verify_token_cached(credentials.credentials, token_type="access")
+
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    return payload
+
+
 async def get_current_user_id(
     credentials: HTTPAuthorizationCredentials = Depends(security)
 ) -> str:
@@ -28,10 +49,10 @@ async def get_current_user_id(
     Dependency to get current user ID from JWT token.
     """
     token = credentials.credentials
-    
-    # Verify token
-    payload = verify_token(token, token_type="access")
-    
+
+    # Verify token (cached for a short TTL when JWT_CACHE_ENABLED)
+    payload = verify_token_cached(token, token_type="access")
+
     if payload is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -47,7 +68,7 @@ async def get_current_user_id(
             detail="Invalid token payload",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
     return user_id
 
 
@@ -63,4 +84,4 @@ async def get_optional_current_user_id(
     try:
         return await get_current_user_id(credentials)
     except HTTPException:
-        return None
\ No newline at end of file
+        return None
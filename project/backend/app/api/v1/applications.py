@@ -1,16 +1,69 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+# list_applications' `status` query parameter shadows the fastapi.status
+# module inside that endpoint; its handlers use this alias instead
+from fastapi import status as fastapi_status
+from fastapi.responses import ORJSONResponse
 from app.api.deps import get_current_user_id
-from app.core.database import get_supabase_client
+from app.core.database import get_supabase_client, run_db
+from app.services.comparison_service import invalidate_comparison_cache
 from supabase import Client
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from rapidfuzz import fuzz, process
+import asyncio
+import base64
+import hashlib
 import json
+import orjson
 import re
+import time
 
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
 
+# Precompiled patterns - these run once per row/term in the scoring hot loop,
+# so avoid re-parsing the pattern on every call
+_RE_NON_ALNUM = re.compile(r'[^a-z0-9\s]')
+_RE_QUOTED = re.compile(r'"([^"]+)"')
+_RE_EXCLUDED = re.compile(r'-(\w+)')
+_RE_EXCLUDED_STRIP = re.compile(r'-\w+')
+
+# Field weights (like Google ranks titles higher than body)
+FIELD_WEIGHTS = {
+    'name': 10,
+    'version': 5,
+    'platform': 3,
+    'binary_type': 3,
+    'manufacturer': 2,
+    'supplier': 2
+}
+
+
+# Small in-process cache for exported SBOM blobs: completed applications
+# never change, so repeated exports shouldn't re-fetch multi-MB JSON
+_SBOM_CACHE_TTL = 600
+_SBOM_CACHE_MAX = 64
+_sbom_cache: Dict[Tuple[str, str], Tuple[float, str, Any]] = {}
+
+# Shared no-match result so non-matching rows allocate nothing
+_ZERO_RELEVANCE = {'total_score': 0, 'match_field': None, 'details': None}
+
+
+def _conditional_json(request: Request, payload: Any, max_age: int = 30) -> Response:
+    """
+    Serialize once with orjson, derive an ETag from the bytes, and answer
+    If-None-Match revalidations with a bodyless 304.
+    """
+    body = orjson.dumps(payload)
+    etag = '"' + hashlib.sha256(body).hexdigest() + '"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={max_age}"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 def normalize_text(text: str) -> str:
     """
     Normalize text for better matching (like Google does).
@@ -26,7 +79,7 @@ def normalize_text(text: str) -> str:
     text = text.lower()
     
     # Remove special characters but keep spaces and alphanumeric
-    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    text = _RE_NON_ALNUM.sub(' ', text)
     
     # Remove extra whitespace
     text = ' '.join(text.split())
@@ -46,16 +99,16 @@ def extract_search_terms(query: str) -> Dict[str, Any]:
     query = query.strip()
     
     # Extract quoted phrases
-    quoted_phrases = re.findall(r'"([^"]+)"', query)
-    
+    quoted_phrases = _RE_QUOTED.findall(query)
+
     # Remove quoted phrases from query for further processing
-    query_without_quotes = re.sub(r'"[^"]+"', '', query)
-    
+    query_without_quotes = _RE_QUOTED.sub('', query)
+
     # Extract excluded terms (words with -)
-    excluded_terms = re.findall(r'-(\w+)', query_without_quotes)
-    
+    excluded_terms = _RE_EXCLUDED.findall(query_without_quotes)
+
     # Remove excluded terms from query
-    query_without_excluded = re.sub(r'-\w+', '', query_without_quotes)
+    query_without_excluded = _RE_EXCLUDED_STRIP.sub('', query_without_quotes)
     
     # Check for OR operator
     has_or = ' OR ' in query_without_excluded.upper()
@@ -66,17 +119,28 @@ def extract_search_terms(query: str) -> Dict[str, Any]:
     
     return {
         'original_query': query,
+        'normalized_query': normalize_text(query),
         'quoted_phrases': quoted_phrases,
         'excluded_terms': excluded_terms,
         'search_terms': terms,
+        # Word-boundary patterns compiled once per request, not once per row
+        'term_patterns': {
+            term.lower(): re.compile(r'\b' + re.escape(term.lower()) + r'\b')
+            for term in terms
+        },
         'has_or': has_or
     }
 
 
-def calculate_relevance_score(app: Dict, search_data: Dict) -> Dict[str, Any]:
+def calculate_relevance_score(
+    app: Dict,
+    search_data: Dict,
+    fuzzy_scores: Optional[Dict[str, Any]] = None,
+    app_index: int = 0
+) -> Dict[str, Any]:
     """
     Calculate relevance score using multiple factors (Google-like ranking).
-    
+
     Factors:
     1. Exact matches (highest priority)
     2. Starts with query (high priority)
@@ -84,114 +148,130 @@ def calculate_relevance_score(app: Dict, search_data: Dict) -> Dict[str, Any]:
     4. Partial matches
     5. Fuzzy matches
     6. Field importance (name > version > platform > type)
+
+    `fuzzy_scores` holds batch-computed rapidfuzz matrices per field
+    (terms x apps); when provided, fuzzy similarity is a lookup instead of
+    a per-call C boundary crossing.
     """
-    
+
     query = search_data['original_query'].lower()
     quoted_phrases = search_data['quoted_phrases']
     excluded_terms = search_data['excluded_terms']
     search_terms = search_data['search_terms']
-    
-    # Initialize score components
-    scores = {
-        'exact_match': 0,
-        'starts_with': 0,
-        'word_boundary': 0,
-        'partial_match': 0,
-        'fuzzy_match': 0,
-        'field_weight': 0
-    }
-    
-    # Field weights (like Google ranks titles higher than body)
-    field_weights = {
-        'name': 10,
-        'version': 5,
-        'platform': 3,
-        'binary_type': 3,
-        'manufacturer': 2,
-        'supplier': 2
-    }
-    
+
+    # Score components tracked as scalars - this runs once per candidate
+    # row, so avoid allocating a dict per app just to sum it afterwards
+    s_exact_match = 0
+    s_starts_with = 0
+    s_word_boundary = 0
+    s_partial_match = 0
+    s_fuzzy_match = 0
+    s_field_weight = 0
+
     match_field = None
     best_field_score = 0
-    
-    # Process each field
-    for field_name, weight in field_weights.items():
+
+    # Lower each field once up front; the values are reused by the scoring
+    # loop, the pre-check and the multi-term bonus
+    fields = []
+    lowered_values = []
+    for field_name, weight in FIELD_WEIGHTS.items():
         field_value = str(app.get(field_name, '')).lower()
         if not field_value or field_value == 'none':
             continue
-        
+        fields.append((field_name, weight, field_value))
+        lowered_values.append(field_value)
+
+    all_text = ' '.join(lowered_values)
+
+    # Cheap short-circuit: if no phrase, term or query prefix appears
+    # anywhere in the row and fuzzy matching provably cannot fire either,
+    # skip the whole field loop
+    if (not any(p.lower() in all_text for p in quoted_phrases)
+            and not any(t.lower() in all_text for t in search_terms)
+            and query not in all_text
+            and (not search_data['normalized_query']
+                 or search_data['normalized_query'] not in normalize_text(all_text))):
+        fuzzy_possible = True
+        if fuzzy_scores is not None:
+            fuzzy_possible = any(
+                fuzzy_scores[field_name][term_idx][app_index] > 70
+                for field_name, _, _ in fields
+                for term_idx in range(len(search_terms))
+            )
+        if not fuzzy_possible:
+            return _ZERO_RELEVANCE
+
+    # Process each field
+    for field_name, weight, field_value in fields:
         field_score = 0
-        
+
         # 1. Check for exact phrase matches (quoted)
         for phrase in quoted_phrases:
             if phrase.lower() in field_value:
                 field_score += 100 * weight
-                scores['exact_match'] += 100
-        
+                s_exact_match += 100
+
         # 2. Check for excluded terms
         for excluded in excluded_terms:
             if excluded.lower() in field_value:
                 # If excluded term found, return very low score
-                return {
-                    'total_score': 0,
-                    'match_field': None,
-                    'details': scores
-                }
-        
+                return _ZERO_RELEVANCE
+
         # 3. Exact match with full query
-        if normalize_text(field_value) == normalize_text(query):
+        if normalize_text(field_value) == search_data['normalized_query']:
             field_score += 95 * weight
-            scores['exact_match'] += 95
-        
+            s_exact_match += 95
+
         # 4. Starts with query
         if field_value.startswith(query):
             field_score += 85 * weight
-            scores['starts_with'] += 85
-        
+            s_starts_with += 85
+
         # 5. Check each search term
-        for term in search_terms:
+        for term_idx, term in enumerate(search_terms):
             term = term.lower()
-            
+
             # Exact word match (word boundary)
-            if re.search(r'\b' + re.escape(term) + r'\b', field_value):
+            if search_data['term_patterns'][term].search(field_value):
                 field_score += 70 * weight
-                scores['word_boundary'] += 70
-            
+                s_word_boundary += 70
+
             # Starts with term
             elif field_value.startswith(term):
                 field_score += 60 * weight
-                scores['starts_with'] += 60
-            
+                s_starts_with += 60
+
             # Contains term
             elif term in field_value:
                 field_score += 50 * weight
-                scores['partial_match'] += 50
-            
+                s_partial_match += 50
+
             # Fuzzy match using RapidFuzz
             else:
-                fuzzy_score = fuzz.partial_ratio(term, field_value)
+                if fuzzy_scores is not None:
+                    fuzzy_score = fuzzy_scores[field_name][term_idx][app_index]
+                else:
+                    fuzzy_score = fuzz.partial_ratio(term, field_value)
                 if fuzzy_score > 70:
                     field_score += (fuzzy_score / 100) * 40 * weight
-                    scores['fuzzy_match'] += fuzzy_score / 100 * 40
-        
+                    s_fuzzy_match += fuzzy_score / 100 * 40
+
         # Track which field had the best match
         if field_score > best_field_score:
             best_field_score = field_score
             match_field = field_name
-            scores['field_weight'] = weight
-    
+            s_field_weight = weight
+
     # Calculate total score
-    total_score = sum(scores.values())
+    total_score = (s_exact_match + s_starts_with + s_word_boundary +
+                   s_partial_match + s_fuzzy_match + s_field_weight)
     
     # Boost for multiple term matches (like Google boosts pages with all search terms)
     if len(search_terms) > 1:
         # Check how many terms matched
         matched_terms = 0
-        all_text = ' '.join([
-            str(app.get(f, '')).lower() 
-            for f in field_weights.keys()
-        ])
-        
+
         for term in search_terms:
             if term.lower() in all_text:
                 matched_terms += 1
@@ -202,10 +282,21 @@ def calculate_relevance_score(app: Dict, search_data: Dict) -> Dict[str, Any]:
         elif matched_terms > 0:
             total_score *= (1 + (matched_terms / len(search_terms)) * 0.3)
     
+    if total_score <= 0:
+        return _ZERO_RELEVANCE
+
+    # The details dict is only materialized for apps that actually scored
     return {
         'total_score': round(total_score, 2),
         'match_field': match_field,
-        'details': scores
+        'details': {
+            'exact_match': s_exact_match,
+            'starts_with': s_starts_with,
+            'word_boundary': s_word_boundary,
+            'partial_match': s_partial_match,
+            'fuzzy_match': s_fuzzy_match,
+            'field_weight': s_field_weight
+        }
     }
 
 
@@ -228,11 +319,74 @@ async def search_applications(
     """
     
     try:
-        # Fetch all user's applications
-        response = supabase_client.table("applications").select(
+        # Extract search terms and operators
+        search_data = extract_search_terms(query)
+
+        # Simple queries go through the indexed server-side search (tsvector +
+        # pg_trgm, see migrations/001_search_applications.sql): Postgres ranks
+        # and returns only the top `limit` rows. Queries using advanced
+        # operators (quotes, -exclusion, OR) keep the in-process scorer.
+        use_rpc = not (
+            search_data['quoted_phrases']
+            or search_data['excluded_terms']
+            or search_data['has_or']
+        )
+        if use_rpc:
+            try:
+                rpc_response = await run_db(supabase_client.rpc(
+                    "search_applications",
+                    {"p_user_id": user_id, "p_query": query, "p_limit": limit}
+                ))
+
+                if rpc_response.data is not None:
+                    return {
+                        "items": rpc_response.data,
+                        "query": query,
+                        "total_results": len(rpc_response.data),
+                        "search_metadata": {
+                            "has_quoted_phrases": False,
+                            "has_excluded_terms": False,
+                            "has_or_operator": False,
+                            "search_terms": search_data['search_terms'],
+                            "quoted_phrases": [],
+                            "excluded_terms": []
+                        }
+                    }
+            except Exception as rpc_error:
+                # RPC not deployed yet (or transient failure) - fall back to
+                # the in-process scorer below
+                print(f"Indexed search unavailable, falling back: {rpc_error}")
+
+        # Fetch the user's applications, prefiltered server-side where
+        # possible: an ilike on the longest term bounds the candidate set so
+        # we never pull (and score) the user's whole table per keystroke
+        db_query = supabase_client.table("applications").select(
             "id, name, version, platform, status, component_count, file_size, "
             "created_at, analyzed_at, binary_type, os, manufacturer, supplier, sbom_format"
-        ).eq("user_id", user_id).execute()
+        ).eq("user_id", user_id)
+
+        prefilter_candidates = search_data['search_terms'] + search_data['quoted_phrases']
+        # Only safe for plain terms: commas/parens/dots would break the
+        # PostgREST or_ filter syntax
+        prefilter_candidates = [
+            t for t in prefilter_candidates if re.fullmatch(r'[\w\s-]+', t)
+        ]
+        if prefilter_candidates:
+            if search_data['has_or']:
+                # OR queries: a row may match any single term, so the
+                # prefilter has to cover all of them
+                prefilter_terms = prefilter_candidates
+            else:
+                prefilter_terms = [max(prefilter_candidates, key=len)]
+            db_query = db_query.or_(
+                ",".join(
+                    f"{field}.ilike.%{term}%"
+                    for term in prefilter_terms
+                    for field in FIELD_WEIGHTS
+                )
+            ).limit(500)
+
+        response = await run_db(db_query)
         
         if not response.data:
             return {
@@ -248,23 +402,38 @@ async def search_applications(
             }
         
         applications = response.data
-        
-        # Extract search terms and operators
-        search_data = extract_search_terms(query)
-        
+
+        # Batch-compute fuzzy similarity per field in one vectorized C call
+        # (terms x apps matrix) instead of a fuzz.partial_ratio call per
+        # app/field/term; workers=-1 runs it thread-parallel
+        fuzzy_scores = None
+        if search_data['search_terms']:
+            terms_lower = [t.lower() for t in search_data['search_terms']]
+            fuzzy_scores = {
+                field: process.cdist(
+                    terms_lower,
+                    [str(app.get(field, '') or '').lower() for app in applications],
+                    scorer=fuzz.partial_ratio,
+                    workers=-1
+                )
+                for field in FIELD_WEIGHTS
+            }
+
         # Calculate relevance scores for all applications
         scored_results = []
-        
-        for app in applications:
-            relevance = calculate_relevance_score(app, search_data)
+
+        for app_index, app in enumerate(applications):
+            relevance = calculate_relevance_score(
+                app, search_data, fuzzy_scores, app_index
+            )
             
-            # Only include results with score > 0
+            # Only include results with score > 0; the row dicts are
+            # request-local, so annotate them in place rather than copying
             if relevance['total_score'] > 0:
-                app_result = app.copy()
-                app_result['similarity_score'] = min(100, relevance['total_score'])
-                app_result['match_field'] = relevance['match_field']
-                app_result['relevance_details'] = relevance['details']
-                scored_results.append(app_result)
+                app['similarity_score'] = min(100, relevance['total_score'])
+                app['match_field'] = relevance['match_field']
+                app['relevance_details'] = relevance['details']
+                scored_results.append(app)
         
         # Sort by relevance score (descending) - like Google
         scored_results.sort(key=lambda x: x['similarity_score'], reverse=True)
@@ -304,50 +473,108 @@ async def search_applications(
 
 @router.get("/")
 async def list_applications(
+    request: Request,
     user_id: str = Depends(get_current_user_id),
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
     platform: Optional[str] = None,
     status: Optional[str] = None,
     binary_type: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from a previous next_cursor"),
     supabase_client: Client = Depends(get_supabase_client)
 ):
-    
+
     try:
+        # count="estimated" is exact below PostgREST's max-rows threshold
+        # and switches to the planner estimate above it, so small lists
+        # stay accurate while big ones stop paying a full COUNT per page
         query = supabase_client.table("applications").select(
             "id, name, version, platform, status, component_count, file_size, "
             "created_at, analyzed_at, binary_type, os, manufacturer, supplier, sbom_format",
-            count="exact"
+            count="estimated"
         ).eq("user_id", user_id)
-        
+
         if platform:
             query = query.eq("platform", platform)
-        
+
         if status:
             query = query.eq("status", status)
-        
+
         if binary_type:
             query = query.eq("binary_type", binary_type)
-        
+
+        if cursor is not None:
+            # Keyset pagination on (created_at, id): O(limit) work per page
+            # instead of OFFSET scanning and discarding all earlier rows
+            try:
+                cursor_ts, cursor_id = base64.urlsafe_b64decode(
+                    cursor.encode()
+                ).decode().split("|", 1)
+            except Exception:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Invalid cursor"
+                )
+
+            query = query.or_(
+                f"created_at.lt.{cursor_ts},"
+                f"and(created_at.eq.{cursor_ts},id.lt.{cursor_id})"
+            )
+            # Fetch one extra row to know whether another page exists
+            query = query.order("created_at", desc=True)\
+                .order("id", desc=True)\
+                .limit(limit + 1)
+
+            response = await run_db(query)
+
+            items = response.data
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                last = items[-1]
+                next_cursor = base64.urlsafe_b64encode(
+                    f"{last['created_at']}|{last['id']}".encode()
+                ).decode()
+
+            return _conditional_json(request, {
+                "items": items,
+                "total": response.count,
+                "page_size": limit,
+                "next_cursor": next_cursor
+            })
+
+        # Legacy OFFSET pagination (kept for existing clients)
         offset = (page - 1) * limit
-        query = query.order("created_at", desc=True).range(offset, offset + limit - 1)
-        
-        response = query.execute()
-        
+        query = query.order("created_at", desc=True).order("id", desc=True)\
+            .range(offset, offset + limit - 1)
+
+        response = await run_db(query)
+
         total = response.count if hasattr(response, 'count') else len(response.data)
         total_pages = (total + limit - 1) // limit
-        
-        return {
-            "items": response.data,
+
+        items = response.data
+        next_cursor = None
+        if items:
+            last = items[-1]
+            next_cursor = base64.urlsafe_b64encode(
+                f"{last['created_at']}|{last['id']}".encode()
+            ).decode()
+
+        return _conditional_json(request, {
+            "items": items,
             "total": total,
             "page": page,
             "page_size": limit,
-            "total_pages": total_pages
-        }
+            "total_pages": total_pages,
+            "next_cursor": next_cursor
+        })
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=fastapi_status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to fetch applications: {str(e)}"
         )
 
@@ -355,35 +582,33 @@ async def list_applications(
 @router.get("/{app_id}")
 async def get_application(
     app_id: str,
+    request: Request,
     user_id: str = Depends(get_current_user_id),
     supabase_client: Client = Depends(get_supabase_client)
 ):
     
     try:
-        response = supabase_client.table("applications").select(
-            "*"
-        ).eq("id", app_id).eq("user_id", user_id).execute()
-        
-        if not response.data:
+        # Single round-trip: embed the component join server-side via PostgREST
+        response = await run_db(supabase_client.table("applications").select(
+            "*, application_components(components(id, name, version, type, language, license, purl, description))"
+        ).eq("id", app_id).eq("user_id", user_id).maybe_single())
+
+        # postgrest 0.13.2 returns None (not a response) for zero rows
+        if response is None or not response.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Application not found"
             )
-        
-        app_data = response.data[0]
-        
-        components_response = supabase_client.table("application_components").select(
-            "components(id, name, version, type, language, license, purl, description)"
-        ).eq("application_id", app_id).execute()
-        
-        components = []
-        for item in components_response.data:
-            if item.get("components"):
-                components.append(item["components"])
-        
-        app_data["components"] = components
-        
-        return app_data
+
+        app_data = response.data
+
+        app_data["components"] = [
+            item["components"]
+            for item in app_data.pop("application_components", [])
+            if item.get("components")
+        ]
+
+        return _conditional_json(request, app_data)
         
     except HTTPException:
         raise
@@ -397,35 +622,34 @@ async def get_application(
 @router.get("/{app_id}/components")
 async def get_application_components(
     app_id: str,
+    request: Request,
     user_id: str = Depends(get_current_user_id),
     supabase_client: Client = Depends(get_supabase_client)
 ):
     
     try:
-        app_response = supabase_client.table("applications").select(
-            "id"
-        ).eq("id", app_id).eq("user_id", user_id).execute()
-        
-        if not app_response.data:
+        # Ownership check and component fetch in one joined select
+        app_response = await run_db(supabase_client.table("applications").select(
+            "id, application_components(components(id, name, version, type, language, license, purl, description, supplier, homepage))"
+        ).eq("id", app_id).eq("user_id", user_id).maybe_single())
+
+        if app_response is None or not app_response.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Application not found"
             )
-        
-        components_response = supabase_client.table("application_components").select(
-            "components(id, name, version, type, language, license, purl, description, supplier, homepage)"
-        ).eq("application_id", app_id).execute()
-        
-        components = []
-        for item in components_response.data:
-            if item.get("components"):
-                components.append(item["components"])
-        
-        return {
+
+        components = [
+            item["components"]
+            for item in app_response.data.get("application_components", [])
+            if item.get("components")
+        ]
+
+        return _conditional_json(request, {
             "application_id": app_id,
             "components": components,
             "total_components": len(components)
-        }
+        })
         
     except HTTPException:
         raise
@@ -439,42 +663,67 @@ async def get_application_components(
 @router.get("/{app_id}/export")
 async def export_sbom(
     app_id: str,
+    request: Request,
     format: str = Query("cyclonedx", regex="^(cyclonedx|spdx)$"),
     user_id: str = Depends(get_current_user_id),
     supabase_client: Client = Depends(get_supabase_client)
 ):
     """
     Export SBOM in requested format (CycloneDX or SPDX).
+
+    Completed SBOM blobs are immutable, so responses carry an ETag derived
+    from (app_id, analyzed_at, format) plus Cache-Control, and a short
+    in-process cache avoids re-fetching multi-MB JSON from Postgres.
     """
-    
+
     try:
-        response = supabase_client.table("applications").select(
-            "sbom_data, spdx_data, name, sbom_format"
-        ).eq("id", app_id).eq("user_id", user_id).execute()
-        
-        if not response.data:
+        # Lightweight metadata fetch first - enough to validate ownership
+        # and compute the ETag without touching the blob columns
+        meta_response = await run_db(supabase_client.table("applications").select(
+            "analyzed_at"
+        ).eq("id", app_id).eq("user_id", user_id).maybe_single())
+
+        if meta_response is None or not meta_response.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Application not found"
             )
-        
-        app_data = response.data[0]
-        
-        if format == "cyclonedx":
-            sbom_data = app_data.get("sbom_data")
-        elif format == "spdx":
-            sbom_data = app_data.get("spdx_data")
-        else:
-            sbom_data = app_data.get("sbom_data")
-        
+
+        analyzed_at = meta_response.data.get("analyzed_at")
+        etag = '"' + hashlib.sha256(
+            f"{app_id}|{analyzed_at}|{format}".encode()
+        ).hexdigest() + '"'
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=300"}
+
+        cache_key = (app_id, format)
+        cached = _sbom_cache.get(cache_key)
+        now = time.time()
+        if cached and cached[0] > now and cached[1] == etag:
+            return ORJSONResponse(content=cached[2], headers=headers)
+
+        column = "sbom_data" if format == "cyclonedx" else "spdx_data"
+        response = await run_db(supabase_client.table("applications").select(
+            column
+        ).eq("id", app_id).eq("user_id", user_id).maybe_single())
+
+        sbom_data = ((response.data if response is not None else None) or {}).get(column)
+
         if not sbom_data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"SBOM data in {format} format not available for this application"
             )
-        
-        return sbom_data
-        
+
+        if len(_sbom_cache) >= _SBOM_CACHE_MAX:
+            _sbom_cache.clear()
+        _sbom_cache[cache_key] = (now + _SBOM_CACHE_TTL, etag, sbom_data)
+
+        return ORJSONResponse(content=sbom_data, headers=headers)
+
     except HTTPException:
         raise
     except Exception as e:
@@ -492,38 +741,67 @@ async def delete_application(
 ):
     
     try:
-        app_response = supabase_client.table("applications").select(
-            "storage_path"
-        ).eq("id", app_id).eq("user_id", user_id).execute()
-        
-        if not app_response.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Application not found"
-            )
-        
-        storage_path = app_response.data[0].get("storage_path")
-        
-        supabase_client.table("application_components").delete().eq(
-            "application_id", app_id
-        ).execute()
-        
-        supabase_client.table("applications").delete().eq(
-            "id", app_id
-        ).execute()
-        
+        # Single transactional round-trip: ownership check plus both row
+        # deletes happen inside the delete_application RPC (see
+        # migrations/003_delete_application.sql)
+        rpc_result = None
+        try:
+            rpc_response = await run_db(supabase_client.rpc(
+                "delete_application",
+                {"p_app_id": app_id, "p_user_id": user_id}
+            ))
+            rpc_result = rpc_response.data
+        except Exception as rpc_error:
+            # RPC not deployed yet - fall back to the sequential path below
+            print(f"delete_application RPC unavailable, falling back: {rpc_error}")
+
+        if rpc_result is not None:
+            if not rpc_result.get("found"):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Application not found"
+                )
+            storage_path = rpc_result.get("storage_path")
+        else:
+            app_response = await run_db(supabase_client.table("applications").select(
+                "storage_path"
+            ).eq("id", app_id).eq("user_id", user_id).maybe_single())
+
+            if app_response is None or not app_response.data:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Application not found"
+                )
+
+            storage_path = app_response.data.get("storage_path")
+
+            # Relationships must go before the application row they reference
+            await run_db(supabase_client.table("application_components").delete().eq(
+                "application_id", app_id
+            ))
+            await run_db(supabase_client.table("applications").delete().eq(
+                "id", app_id
+            ))
+
+        # Comparisons cache app rows and component lists for 300s; a
+        # deleted application must not keep being served from it
+        invalidate_comparison_cache(app_id)
+
         if storage_path:
-            try:
-                file_path = storage_path.replace("uploads/", "")
-                supabase_client.storage.from_("uploads").remove([file_path])
-            except Exception as e:
-                print(f"Failed to delete file from storage: {str(e)}")
-        
+            def _delete_storage_file():
+                try:
+                    file_path = storage_path.replace("uploads/", "")
+                    supabase_client.storage.from_("uploads").remove([file_path])
+                except Exception as e:
+                    print(f"Failed to delete file from storage: {str(e)}")
+
+            await asyncio.to_thread(_delete_storage_file)
+
         return {
             "message": "Application deleted successfully",
             "application_id": app_id
         }
-        
+
     except HTTPException:
         raise
     except Exception as e:
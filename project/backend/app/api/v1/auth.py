@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, status
 from app.models.user import (
     UserCreate, 
     UserLogin, 
@@ -15,7 +15,7 @@ from app.api.deps import get_auth_service, get_current_user_id
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post("/register", status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
     auth_service: AuthService = Depends(get_auth_service)
@@ -23,14 +23,7 @@ async def register(
     """
     Register a new user.
     """
-    try:
-        result = await auth_service.register(user_data)
-        return result
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+    return await auth_service.register(user_data)
 
 
 @router.post("/login", response_model=Token)
@@ -41,15 +34,7 @@ async def login(
     """
     Login with email and password.
     """
-    try:
-        token = await auth_service.login(credentials)
-        return token
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e),
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return await auth_service.login(credentials)
 
 
 @router.post("/refresh", response_model=Token)
@@ -60,15 +45,7 @@ async def refresh_token(
     """
     Refresh access token using refresh token.
     """
-    try:
-        new_token = await auth_service.refresh_token(token_data.refresh_token)
-        return new_token
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail=str(e),
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return await auth_service.refresh_token(token_data.refresh_token)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -79,17 +56,10 @@ async def get_current_user(
     """
     Get current user information.
     """
-    try:
-        user = await auth_service.get_current_user(user_id)
-        return user
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=str(e)
-        )
+    return await auth_service.get_current_user(user_id)
 
 
-@router.post("/forgot-password", response_model=dict)
+@router.post("/forgot-password")
 async def forgot_password(
     data: PasswordReset,
     auth_service: AuthService = Depends(get_auth_service)
@@ -100,7 +70,7 @@ async def forgot_password(
     result = await auth_service.request_password_reset(data.email)
     return result
 
-@router.post("/reset-password", response_model=dict)
+@router.post("/reset-password")
 async def reset_password(
     data: PasswordResetConfirm,
     auth_service: AuthService = Depends(get_auth_service)
@@ -1,14 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.api.deps import get_current_user_id
+from app.api.deps import get_current_token_payload
 from app.services.contact_service import ContactService
 from app.core.database import get_supabase_client
-from app.core.security import verify_token
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from supabase import Client
+from typing import Dict, Any
 
 router = APIRouter(prefix="/contact", tags=["contact"])
-security = HTTPBearer()
 
 
 class ContactRequest(BaseModel):
@@ -25,23 +23,14 @@ class ContactResponse(BaseModel):
 @router.post("/", response_model=ContactResponse, status_code=status.HTTP_201_CREATED)
 async def send_contact_message(
     contact_data: ContactRequest,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    payload: Dict[str, Any] = Depends(get_current_token_payload),
     supabase_client: Client = Depends(get_supabase_client)
 ):
     """
     Send contact form message via email.
     """
     try:
-        # Get token and decode to get user info
-        token = credentials.credentials
-        payload = verify_token(token, token_type="access")
-        
-        if payload is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token"
-            )
-        
+        # Token already verified and decoded once by the dependency
         user_id = payload.get("sub")
         user_email = payload.get("email")
         
@@ -1,107 +1,262 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from app.api.deps import get_current_user_id
 from app.services.storage_service import StorageService
 from app.services.syft_service import SyftService
 from app.services.sbom_service import SBOMService
-from app.core.database import get_supabase_client
+from app.core.database import get_supabase_client, run_db
 from app.core.config import settings
 from supabase import Client
+from pydantic import BaseModel
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+import aiofiles
+import hashlib
+import logging
 import tempfile
+import threading
+import time
 import os
-import traceback
 import asyncio
-import threading
+from typing import Any, Dict, Tuple
+
 
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/upload", tags=["Upload"])
 
+_MB = 1024 * 1024
+_MAX_FILE_SIZE_MB = settings.MAX_FILE_SIZE / _MB
+
+# Short-lived cache for GET /upload/status, which the frontend polls
+# every second or two during background processing. Entries live 2s
+# while processing and 60s once the row reaches a terminal state; the
+# background task pops the entry when it changes the row.
+_STATUS_CACHE_TTL = 2.0
+_STATUS_CACHE_TTL_TERMINAL = 60.0
+_STATUS_CACHE_MAX = 10000
+_status_cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+_status_cache_lock = threading.Lock()
+
+
+def _status_cache_get(key: Tuple[str, str]):
+    with _status_cache_lock:
+        entry = _status_cache.get(key)
+        if entry is None:
+            return None
+        data, expires_at = entry
+        if time.time() >= expires_at:
+            del _status_cache[key]
+            return None
+        return data
+
+
+def _status_cache_put(key: Tuple[str, str], data: Any) -> None:
+    ttl = (
+        _STATUS_CACHE_TTL_TERMINAL
+        if data.get("status") in ("completed", "failed")
+        else _STATUS_CACHE_TTL
+    )
+    with _status_cache_lock:
+        if len(_status_cache) >= _STATUS_CACHE_MAX:
+            _status_cache.clear()
+        _status_cache[key] = (data, time.time() + ttl)
+
+
+def _status_cache_pop(key: Tuple[str, str]) -> None:
+    with _status_cache_lock:
+        _status_cache.pop(key, None)
+
+
+class _StatusBatcher:
+    """
+    Coalesces concurrent status lookups into one IN (...) query.
+
+    A dashboard with N in-flight uploads polls N status endpoints at
+    once; lookups arriving within a short window share a single
+    round-trip and rows are demultiplexed back to callers by id.
+    """
+
+    _WINDOW = 0.005  # seconds to wait for more lookups to pile up
+    _COLUMNS = (
+        "id, user_id, name, status, error_message, "
+        "component_count, analyzed_at, platform"
+    )
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._flush_task = None
+
+    async def load(self, supabase_client: Client, app_id: str, user_id: str):
+        loop = asyncio.get_event_loop()
+        key = (app_id, user_id)
+        fut = self._pending.get(key)
+        if fut is None:
+            fut = loop.create_future()
+            self._pending[key] = fut
+            if self._flush_task is None or self._flush_task.done():
+                self._flush_task = asyncio.create_task(self._flush(supabase_client))
+        return await fut
+
+    async def _flush(self, supabase_client: Client):
+        await asyncio.sleep(self._WINDOW)
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            ids = list({app_id for app_id, _ in pending})
+            response = await run_db(
+                supabase_client.table("applications")
+                .select(self._COLUMNS)
+                .in_("id", ids)
+            )
+            rows = {
+                (row["id"], row["user_id"]): row
+                for row in (response.data or [])
+            }
+            for key, fut in pending.items():
+                if not fut.done():
+                    row = rows.get(key)
+                    if row is not None:
+                        # Don't leak the ownership column to clients
+                        row = {k: v for k, v in row.items() if k != "user_id"}
+                    fut.set_result(row)
+        except Exception as e:
+            for fut in pending.values():
+                if not fut.done():
+                    fut.set_exception(e)
+        finally:
+            # Lookups that arrived while the query above was in flight
+            # created futures but saw a not-yet-done flush task and did
+            # not schedule another one; flush again so they resolve too.
+            if self._pending:
+                self._flush_task = asyncio.create_task(self._flush(supabase_client))
+
+
+_status_batcher = _StatusBatcher()
+
+# The event loop keeps only weak references to tasks, so a
+# fire-and-forget create_task result can be garbage-collected mid-run.
+# Hold each background task here until it finishes.
+_background_tasks: set = set()
 
-def get_storage_service(
+
+def _spawn_background(coro) -> asyncio.Task:
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return task
+
+# Shared pool for the CPU/subprocess-bound Syft work. Pooled threads are
+# reused across uploads instead of spawning a fresh thread (and event
+# loop) per request, and max_workers bounds concurrent SBOM generation.
+_SBOM_EXECUTOR = ThreadPoolExecutor(
+    max_workers=os.cpu_count(),
+    thread_name_prefix="sbom"
+)
+
+
+async def get_storage_service(
     supabase_client: Client = Depends(get_supabase_client)
 ) -> StorageService:
     return StorageService(supabase_client)
 
 
-def get_sbom_service(
+async def get_sbom_service(
     supabase_client: Client = Depends(get_supabase_client)
 ) -> SBOMService:
     return SBOMService(supabase_client)
 
 
+@lru_cache(maxsize=1)
+def _syft_service() -> SyftService:
+    """Process-wide SyftService instance (stateless, safe to share)."""
+    return SyftService()
+
+
+async def get_syft_service() -> SyftService:
+    return _syft_service()
+
+
 async def process_sbom_background(
     user_id: str,
     app_id: str,
-    file_content: bytes,
+    temp_path: str,
     filename: str,
     supabase_client: Client
 ):
     """
     Background task to process SBOM.
+
+    Reuses the temp file already streamed to disk by upload_file and is
+    responsible for deleting it when done.
     """
-    temp_path = None
-    
     try:
-        # Create temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{filename}") as temp_file:
-            temp_file.write(file_content)
-            temp_path = temp_file.name
-        
-        print(f"Processing file: {filename} (size: {len(file_content)} bytes)")
-        
+        logger.debug("Processing file: %s (size: %d bytes)", filename, os.path.getsize(temp_path))
+
         # Initialize services
-        syft_service = SyftService()
+        syft_service = _syft_service()
         sbom_service = SBOMService(supabase_client)
-        
+
         # Detect platform from filename first (more reliable)
         platform = syft_service.detect_platform_from_file(filename)
-        print(f"Detected platform from filename: {platform}")
-        
-        # Generate BOTH SBOMs
+        logger.debug("Detected platform from filename: %s", platform)
+
+        # Generate BOTH SBOMs in parallel - the Syft subprocesses release
+        # the GIL, so the two formats run concurrently in the shared pool
+        # while the DB updates below stay on the event loop
         loop = asyncio.get_event_loop()
-        with ThreadPoolExecutor() as executor:
-            cyclonedx_data, spdx_data = await loop.run_in_executor(
-                executor, 
-                lambda: syft_service.generate_sbom_sync(temp_path)
+        cyclonedx_data, spdx_data = await asyncio.gather(
+            loop.run_in_executor(
+                _SBOM_EXECUTOR, syft_service.generate_cyclonedx_sync, temp_path
+            ),
+            loop.run_in_executor(
+                _SBOM_EXECUTOR, syft_service.generate_spdx_sync, temp_path
             )
-        
+        )
+
         # Parse components from CycloneDX
         components = syft_service.parse_cyclonedx_components(cyclonedx_data)
-        
+
         # If platform is still unknown, try detecting from SBOM content
         if platform == "unknown":
             platform = syft_service.detect_platform_from_sbom(cyclonedx_data)
-            print(f"Detected platform from SBOM content: {platform}")
-        
+            logger.debug("Detected platform from SBOM content: %s", platform)
+
         # Store SBOM with BOTH formats
         await sbom_service.update_application_sbom(
             user_id,
-            app_id, 
-            cyclonedx_data, 
+            app_id,
+            cyclonedx_data,
             spdx_data,
-            components, 
+            components,
             platform
         )
-        
+
         # Clean up
         if temp_path and os.path.exists(temp_path):
             os.unlink(temp_path)
-        
-        print(f"Background processing completed for {app_id}")
-        
+
+        # Let the next status poll see the fresh row immediately
+        _status_cache_pop((app_id, user_id))
+
+        logger.info("Background processing completed for %s", app_id)
+
     except Exception as e:
-        print(f"Background processing failed: {str(e)}")
-        print(f"Full traceback: {traceback.format_exc()}")
-        
+        logger.exception("Background processing failed for %s", app_id)
+
         # Update status to failed
         try:
-            supabase_client.table("applications").update({
+            await run_db(supabase_client.table("applications").update({
                 "status": "failed",
                 "error_message": str(e)
-            }).eq("id", app_id).execute()
-        except Exception as db_error:
-            print(f"Failed to update DB: {str(db_error)}")
-        
+            }).eq("id", app_id))
+        except Exception:
+            logger.exception("Failed to update DB after background failure")
+
+        _status_cache_pop((app_id, user_id))
+
         # Clean up temp file
         if temp_path and os.path.exists(temp_path):
             try:
@@ -112,206 +267,392 @@ async def process_sbom_background(
 
 @router.post("/")
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     user_id: str = Depends(get_current_user_id),
     storage_service: StorageService = Depends(get_storage_service),
     sbom_service: SBOMService = Depends(get_sbom_service),
+    syft_service: SyftService = Depends(get_syft_service),
     supabase_client: Client = Depends(get_supabase_client)
 ):
     """
     Upload file with streaming support for large files.
     """
     temp_upload_path = None
-    
+    background_started = False
+
     try:
-        print(f"\n{'='*60}")
-        print(f"UPLOAD REQUEST RECEIVED")
-        print(f"{'='*60}")
-        
         # Validate filename
         if not file.filename:
-            print("ERROR: No filename provided")
+            logger.debug("Upload rejected: no filename provided")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Filename is required"
             )
-        
-        print(f"Filename: {file.filename}")
-        print(f"Content-Type: {file.content_type}")
-        print(f"User ID: {user_id}")
-        
+
+        logger.debug(
+            "Upload received: %s (%s) for user %s",
+            file.filename, file.content_type, user_id
+        )
+
+        # Reject obviously oversized bodies from the header before
+        # reading a single byte (the streaming loop still enforces the
+        # limit for clients that lie or use chunked encoding)
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() \
+                and int(content_length) > settings.MAX_FILE_SIZE:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File too large. Maximum size is {_MAX_FILE_SIZE_MB:.0f}MB"
+            )
+
         # Stream file to disk to avoid memory issues with large files
-        print(f"Streaming file to disk...")
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=f"_upload_{file.filename}") as temp_upload:
-                temp_upload_path = temp_upload.name
-                
-                # Write in chunks to avoid memory issues
-                chunk_size = 1024 * 1024  # 1MB chunks
-                file_size = 0
+            fd, temp_upload_path = tempfile.mkstemp(suffix=f"_upload_{file.filename}")
+            os.close(fd)
+
+            # Write in chunks via aiofiles so the blocking write syscalls
+            # happen off the event loop, hashing as we go so the file
+            # never has to be read back into RAM
+            chunk_size = _MB  # 1MB chunks
+            file_size = 0
+            hasher = hashlib.sha256()
+            async with aiofiles.open(temp_upload_path, "wb") as temp_upload:
                 while chunk := await file.read(chunk_size):
-                    temp_upload.write(chunk)
                     file_size += len(chunk)
-                    if file_size % (5 * 1024 * 1024) == 0:  # Log every 5MB
-                        print(f"  Streamed {file_size / (1024*1024):.1f} MB...")
-            
-            print(f"File streamed successfully: {file_size} bytes ({file_size/(1024*1024):.2f} MB)")
-            
+                    # Abort oversized uploads mid-stream instead of
+                    # buffering the whole body first
+                    if file_size > settings.MAX_FILE_SIZE:
+                        logger.debug(
+                            "Upload rejected mid-stream: file too large (> %d)",
+                            settings.MAX_FILE_SIZE
+                        )
+                        raise HTTPException(
+                            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"File too large. Maximum size is {_MAX_FILE_SIZE_MB:.0f}MB"
+                        )
+                    await temp_upload.write(chunk)
+                    hasher.update(chunk)
+            file_hash = hasher.hexdigest()
+
+            logger.debug("File streamed: %d bytes (%.2f MB)", file_size, file_size / _MB)
+
+        except HTTPException:
+            raise
         except Exception as read_error:
-            print(f"ERROR streaming file: {str(read_error)}")
-            print(f"Full traceback: {traceback.format_exc()}")
+            logger.exception("Failed to stream upload to disk")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to read file: {str(read_error)}"
             )
-        
+
         # Validate file size
         if file_size == 0:
-            print("ERROR: File is empty")
-            if temp_upload_path and os.path.exists(temp_upload_path):
-                os.unlink(temp_upload_path)
+            logger.debug("Upload rejected: file is empty")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="File is empty"
             )
-        
-        if file_size > settings.MAX_FILE_SIZE:
-            print(f"ERROR: File too large ({file_size} > {settings.MAX_FILE_SIZE})")
-            if temp_upload_path and os.path.exists(temp_upload_path):
-                os.unlink(temp_upload_path)
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"File too large. Maximum size is {settings.MAX_FILE_SIZE / (1024*1024):.0f}MB"
-            )
-        
-        # Read file content for storage upload
-        print(f"Reading file for storage upload...")
-        with open(temp_upload_path, 'rb') as f:
-            file_content = f.read()
-        
+
         # Detect platform from filename
-        print(f"Detecting platform...")
         try:
-            syft_service = SyftService()
             platform = syft_service.detect_platform_from_file(file.filename)
-            print(f"Platform detected: {platform}")
-        except Exception as platform_error:
-            print(f"Platform detection failed: {str(platform_error)}")
+            logger.debug("Platform detected: %s", platform)
+        except Exception:
+            logger.exception("Platform detection failed")
             platform = "unknown"
-        
-        # Upload to storage
-        print(f"Uploading to Supabase Storage...")
-        try:
-            upload_result = await storage_service.upload_file(
-                file_content,
-                file.filename,
-                user_id
-            )
-            print(f"File uploaded: {upload_result['storage_path']}")
-        except Exception as storage_error:
-            print(f"ERROR uploading to storage: {str(storage_error)}")
-            print(f"Full traceback: {traceback.format_exc()}")
-            if temp_upload_path and os.path.exists(temp_upload_path):
-                os.unlink(temp_upload_path)
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Storage upload failed: {str(storage_error)}"
-            )
-        
-        # Create application record or get existing one
-        print(f"Checking for existing application or creating new record...")
+
+        # Create application record or get existing one. The storage key
+        # is content-addressed, so it is known before uploading - and for
+        # a duplicate the file is already in storage, letting us skip the
+        # storage round-trip entirely.
+        storage_path = (
+            f"{settings.STORAGE_BUCKET}/"
+            f"{storage_service.object_path(file.filename, user_id, file_hash)}"
+        )
         try:
-            # MODIFIED: Now returns tuple (app_id, is_new)
-            app_id, is_new = await sbom_service.store_application(
+            # MODIFIED: Now returns tuple (app_id, is_new, app_status)
+            app_id, is_new, app_status = await sbom_service.store_application(
                 user_id=user_id,
                 filename=file.filename,
-                file_size=upload_result["file_size"],
-                file_hash=upload_result["file_hash"],
-                storage_path=upload_result["storage_path"],
+                file_size=file_size,
+                file_hash=file_hash,
+                storage_path=storage_path,
                 platform=platform
             )
-            print(f"Application {'created' if is_new else 'found existing'}: {app_id}")
+            logger.debug("Application %s: %s", 'created' if is_new else 'found existing', app_id)
         except Exception as db_error:
-            print(f"ERROR creating database record: {str(db_error)}")
-            print(f"Full traceback: {traceback.format_exc()}")
-            if temp_upload_path and os.path.exists(temp_upload_path):
-                os.unlink(temp_upload_path)
+            logger.exception("Failed to create application record")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {str(db_error)}"
             )
-        
-        # MODIFIED: Only start background processing if this is a new file
-        if is_new:
-            print(f"Starting background SBOM generation for new file...")
+
+        # A duplicate whose previous attempt failed gets the full
+        # pipeline again instead of a "completed" answer it never earned
+        needs_processing = is_new or app_status == "failed"
+        if needs_processing and not is_new:
+            logger.info("Previous processing failed for %s; retrying", app_id)
             try:
-                def run_background():
-                    asyncio.run(process_sbom_background(
-                        user_id, app_id, file_content, file.filename, supabase_client
-                    ))
-                
-                thread = threading.Thread(target=run_background, daemon=True)
-                thread.start()
-                print(f"Background task started in separate thread")
-            except Exception as bg_error:
-                print(f"Background task failed to queue: {str(bg_error)}")
-        else:
-            print(f"Using existing SBOM data, no background processing needed")
-        
-        # Clean up temp upload file
-        if temp_upload_path and os.path.exists(temp_upload_path):
+                await run_db(supabase_client.table("applications").update({
+                    "status": "processing",
+                    "error_message": None
+                }).eq("id", app_id))
+            except Exception:
+                logger.exception("Failed to reset application for retry")
+            _status_cache_pop((app_id, user_id))
+
+        # Upload to storage (skipped only when the duplicate already
+        # processed successfully; retries tolerate an existing object)
+        if needs_processing:
             try:
-                os.unlink(temp_upload_path)
-                print(f"Temp file cleaned up")
-            except:
-                pass
-        
-        print(f"{'='*60}")
-        print(f"UPLOAD SUCCESSFUL")
-        print(f"{'='*60}\n")
-        
-        # MODIFIED: Enhanced response with duplicate info
-        return {
-            "message": "File uploaded successfully." + 
-                       (" SBOM generation in progress." if is_new else " Using existing SBOM data."),
+                upload_result = await storage_service.upload_file(
+                    temp_upload_path,
+                    file.filename,
+                    user_id,
+                    file_hash=file_hash,
+                    file_size=file_size
+                )
+                logger.debug("File uploaded to storage: %s", upload_result['storage_path'])
+            except Exception as storage_error:
+                logger.exception("Storage upload failed")
+                # Best effort: don't leave the fresh record stuck in 'processing'
+                try:
+                    await run_db(supabase_client.table("applications").update({
+                        "status": "failed",
+                        "error_message": f"Storage upload failed: {str(storage_error)}"
+                    }).eq("id", app_id))
+                except Exception:
+                    logger.exception("Failed to mark application as failed")
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=f"Storage upload failed: {str(storage_error)}"
+                )
+
+        # MODIFIED: Only start background processing for new files and
+        # retried failures
+        if needs_processing:
+            try:
+                # Schedule on the running loop; only the Syft call inside
+                # hops to the shared executor
+                _spawn_background(process_sbom_background(
+                    user_id, app_id, temp_upload_path, file.filename, supabase_client
+                ))
+                background_started = True
+                logger.debug("Background SBOM generation scheduled for %s", app_id)
+            except Exception:
+                logger.exception("Background task failed to queue")
+        else:
+            logger.debug("Using existing SBOM data, no background processing needed")
+
+        logger.info("Upload successful: %s -> %s", file.filename, app_id)
+
+        # MODIFIED: Enhanced response with duplicate info (returned
+        # directly as ORJSONResponse to skip the jsonable_encoder pass).
+        # New files answer 202 Accepted - SBOM generation is still
+        # running and the frontend polls /status/{app_id}.
+        return ORJSONResponse(status_code=(
+            status.HTTP_202_ACCEPTED if needs_processing else status.HTTP_200_OK
+        ), content={
+            "message": "File uploaded successfully." +
+                       (" SBOM generation in progress." if needs_processing else " Using existing SBOM data."),
             "application_id": app_id,
             "filename": file.filename,
             "file_size": file_size,
             "platform": platform,
-            "status": "processing" if is_new else "completed",
+            "status": "processing" if needs_processing else "completed",
             "is_duplicate": not is_new,
-            "reused_existing": not is_new
-        }
-        
+            "reused_existing": not needs_processing
+        })
+
     except HTTPException:
-        # Clean up temp file on HTTP errors
-        if temp_upload_path and os.path.exists(temp_upload_path):
-            try:
-                os.unlink(temp_upload_path)
-            except:
-                pass
         raise
     except Exception as e:
-        print(f"\n{'='*60}")
-        print(f"UPLOAD FAILED - UNHANDLED EXCEPTION")
-        print(f"{'='*60}")
-        print(f"Error: {str(e)}")
-        print(f"Type: {type(e).__name__}")
-        print(f"Full traceback:")
-        print(traceback.format_exc())
-        print(f"{'='*60}\n")
-        
-        # Clean up temp file
-        if temp_upload_path and os.path.exists(temp_upload_path):
-            try:
-                os.unlink(temp_upload_path)
-            except:
-                pass
-        
+        logger.exception("Upload failed with unhandled exception")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Upload failed: {str(e)}"
         )
+    finally:
+        # Single cleanup point; the background task takes ownership of
+        # the temp file when it was scheduled
+        if temp_upload_path and not background_started:
+            Path(temp_upload_path).unlink(missing_ok=True)
+
+
+class PresignUploadRequest(BaseModel):
+    filename: str
+    file_hash: str
+    file_size: int
+
+
+class RegisterUploadRequest(BaseModel):
+    filename: str
+    file_hash: str
+    file_size: int
+
+
+async def _process_sbom_from_storage(
+    user_id: str,
+    app_id: str,
+    object_path: str,
+    filename: str,
+    supabase_client: Client,
+    storage_service: StorageService
+):
+    """
+    Fetch a directly-uploaded object into a temp file and run the normal
+    background pipeline on it.
+    """
+    try:
+        content = await storage_service.download_file(object_path)
+        fd, temp_path = tempfile.mkstemp(suffix=f"_upload_{filename}")
+        os.close(fd)
+        async with aiofiles.open(temp_path, "wb") as f:
+            await f.write(content)
+        del content
+    except Exception as e:
+        logger.exception("Failed to fetch direct upload for %s", app_id)
+        try:
+            await run_db(supabase_client.table("applications").update({
+                "status": "failed",
+                "error_message": f"Could not read uploaded file: {str(e)}"
+            }).eq("id", app_id))
+        except Exception:
+            logger.exception("Failed to update DB after fetch failure")
+        _status_cache_pop((app_id, user_id))
+        return
+
+    await process_sbom_background(user_id, app_id, temp_path, filename, supabase_client)
+
+
+@router.post("/presign")
+async def presign_upload(
+    data: PresignUploadRequest,
+    user_id: str = Depends(get_current_user_id),
+    storage_service: StorageService = Depends(get_storage_service)
+):
+    """
+    Issue a short-lived signed URL so the client can PUT the file
+    straight to Supabase Storage, keeping the file bytes off the API
+    process entirely. The client computes the SHA-256 locally (the
+    storage key is content-addressed) and calls /upload/register once
+    the PUT completes.
+    """
+    if not data.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filename is required"
+        )
+    if data.file_size <= 0 or data.file_size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size is {_MAX_FILE_SIZE_MB:.0f}MB"
+        )
+
+    object_path = storage_service.object_path(data.filename, user_id, data.file_hash)
+
+    try:
+        signed = await asyncio.to_thread(
+            storage_service.client.storage.from_(storage_service.bucket).create_signed_upload_url,
+            object_path
+        )
+    except Exception as e:
+        logger.exception("Failed to create signed upload URL")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Could not create upload URL: {str(e)}"
+        )
+
+    return ORJSONResponse({
+        "upload_url": signed.get("signed_url") or signed.get("signedUrl"),
+        "token": signed.get("token"),
+        "path": object_path
+    })
+
+
+@router.post("/register")
+async def register_upload(
+    data: RegisterUploadRequest,
+    user_id: str = Depends(get_current_user_id),
+    storage_service: StorageService = Depends(get_storage_service),
+    sbom_service: SBOMService = Depends(get_sbom_service),
+    syft_service: SyftService = Depends(get_syft_service),
+    supabase_client: Client = Depends(get_supabase_client)
+):
+    """
+    Register a file the client PUT directly to storage via /presign:
+    create (or reuse) the application record and kick off SBOM
+    generation from the stored object.
+    """
+    if not data.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Filename is required"
+        )
+    if data.file_size <= 0 or data.file_size > settings.MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File too large. Maximum size is {_MAX_FILE_SIZE_MB:.0f}MB"
+        )
+
+    try:
+        platform = syft_service.detect_platform_from_file(data.filename)
+    except Exception:
+        platform = "unknown"
+
+    object_path = storage_service.object_path(data.filename, user_id, data.file_hash)
+    storage_path = f"{settings.STORAGE_BUCKET}/{object_path}"
+
+    try:
+        app_id, is_new, app_status = await sbom_service.store_application(
+            user_id=user_id,
+            filename=data.filename,
+            file_size=data.file_size,
+            file_hash=data.file_hash,
+            storage_path=storage_path,
+            platform=platform
+        )
+    except Exception as db_error:
+        logger.exception("Failed to create application record for direct upload")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Database error: {str(db_error)}"
+        )
+
+    # Duplicates whose previous attempt failed are reprocessed from the
+    # freshly PUT object rather than reported as completed
+    needs_processing = is_new or app_status == "failed"
+    if needs_processing and not is_new:
+        logger.info("Previous processing failed for %s; retrying", app_id)
+        try:
+            await run_db(supabase_client.table("applications").update({
+                "status": "processing",
+                "error_message": None
+            }).eq("id", app_id))
+        except Exception:
+            logger.exception("Failed to reset application for retry")
+        _status_cache_pop((app_id, user_id))
+
+    if needs_processing:
+        _spawn_background(_process_sbom_from_storage(
+            user_id, app_id, object_path, data.filename,
+            supabase_client, storage_service
+        ))
+
+    return ORJSONResponse(status_code=(
+        status.HTTP_202_ACCEPTED if needs_processing else status.HTTP_200_OK
+    ), content={
+        "message": "File registered successfully." +
+                   (" SBOM generation in progress." if needs_processing else " Using existing SBOM data."),
+        "application_id": app_id,
+        "filename": data.filename,
+        "file_size": data.file_size,
+        "platform": platform,
+        "status": "processing" if needs_processing else "completed",
+        "is_duplicate": not is_new,
+        "reused_existing": not needs_processing
+    })
 
 
 @router.get("/status/{app_id}")
@@ -323,25 +664,29 @@ async def get_upload_status(
     """
     Check upload/processing status.
     """
-    
+
     try:
-        response = supabase_client.table("applications").select(
-            "id, name, status, error_message, component_count, analyzed_at, platform"
-        ).eq("id", app_id).eq("user_id", user_id).execute()
-        
-        if not response.data:
+        cache_key = (app_id, user_id)
+        cached = _status_cache_get(cache_key)
+        if cached is not None:
+            return ORJSONResponse(cached)
+
+        row = await _status_batcher.load(supabase_client, app_id, user_id)
+
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Application not found"
             )
-        
-        return response.data[0]
-        
+
+        _status_cache_put(cache_key, row)
+        return ORJSONResponse(row)
+
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Status check failed: {str(e)}")
+        logger.exception("Status check failed for %s", app_id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
-        )
\ No newline at end of file
+        )
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 import os
 from pathlib import Path
 
@@ -27,6 +28,12 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    # JWT verification cache (opt-in) - skips token decoding for a short
+    # window so the hot auth path doesn't re-verify the same token per request
+    JWT_CACHE_ENABLED: bool = False
+    JWT_CACHE_TTL_SECONDS: int = 10
+    JWT_CACHE_MAX_SIZE: int = 10000
     
     # Storage Configuration
     STORAGE_BUCKET: str = "uploads"
@@ -34,6 +41,10 @@ class Settings(BaseSettings):
 
     # Frontend URL for reset links - environment aware
     FRONTEND_URL: Optional[str] = None
+
+    # CORS - explicit origins; populated from FRONTEND_URL in __init__
+    # when not set via environment
+    ALLOWED_ORIGINS: Optional[List[str]] = None
     PASSWORD_RESET_TOKEN_EXPIRE_MINUTES: int = 30
 
     # Email settings - MUST be set via environment variables
@@ -51,6 +62,16 @@ class Settings(BaseSettings):
             else:
                 # Development environment
                 self.FRONTEND_URL = "http://localhost:5173"
+
+        if self.ALLOWED_ORIGINS is None:
+            if self.ENVIRONMENT == "production":
+                self.ALLOWED_ORIGINS = [self.FRONTEND_URL]
+            else:
+                self.ALLOWED_ORIGINS = [
+                    self.FRONTEND_URL,
+                    "http://localhost:5173",
+                    "http://localhost:3000",
+                ]
     
     class Config:
         # Look for .env file in parent directory (project/)
@@ -59,18 +80,17 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-# Create global settings instance
-settings = Settings()
+@lru_cache
+def get_settings() -> Settings:
+    """
+    Build the Settings instance exactly once per process.
+
+    Usable as a FastAPI dependency (Depends(get_settings)) and
+    overridable in tests via get_settings.cache_clear().
+    """
+    return Settings()
 
 
-# Print loaded config (for debugging - remove in production)
-if settings.DEBUG:
-    print("Configuration loaded successfully!")
-    print(f"Project: {settings.PROJECT_NAME}")
-    print(f"Environment: {settings.ENVIRONMENT}")
-    print(f"Frontend URL: {settings.FRONTEND_URL}")
-    print(f"Supabase URL: {settings.SUPABASE_URL}")
-    print(f"Storage Bucket: {settings.STORAGE_BUCKET}")
-    print(f"Max File Size: {settings.MAX_FILE_SIZE / (1024*1024):.0f}MB")
-    # NEVER print sensitive values like API keys!
-    print(f"Resend API Key: {'*' * 20} (hidden)")
\ No newline at end of file
+# Module-level alias kept for the existing `from app.core.config import
+# settings` imports; it resolves through the cache above
+settings = get_settings()
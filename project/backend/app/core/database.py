@@ -1,25 +1,47 @@
 from supabase import create_client, Client
+from supabase.lib.client_options import ClientOptions
 from app.core.config import settings
-from typing import Optional
+from typing import Any, Optional
+import asyncio
+import logging
+import threading
+
+
+logger = logging.getLogger(__name__)
 
 
 class DatabaseClient:
     """Singleton class for Supabase database client."""
-    
+
     _instance: Optional[Client] = None
-    
+    _lock = threading.Lock()
+
     @classmethod
     def get_client(cls) -> Client:
         """
         Get or create Supabase client instance.
+
+        The client is built exactly once per process and reused across
+        requests, so the TCP/TLS/auth handshake is never paid per request
+        and Supabase's pooler connection limit is not exhausted.
         """
         if cls._instance is None:
-            cls._instance = create_client(
-                supabase_url=settings.SUPABASE_URL,
-                supabase_key=settings.SUPABASE_SERVICE_KEY  # Use service key for backend
-            )
-            print("Supabase client initialized")
-        
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = create_client(
+                        supabase_url=settings.SUPABASE_URL,
+                        supabase_key=settings.SUPABASE_SERVICE_KEY,  # Use service key for backend
+                        # The underlying httpx clients keep-alive and pool
+                        # connections by default; pin explicit timeouts so
+                        # a stuck Supabase call can't hold a pooled
+                        # connection (and its worker thread) indefinitely
+                        options=ClientOptions(
+                            postgrest_client_timeout=30,
+                            storage_client_timeout=300,
+                        )
+                    )
+                    logger.info("Supabase client initialized")
+
         return cls._instance
     
     @classmethod
@@ -29,12 +51,22 @@ class DatabaseClient:
 
 
 # Create a function to get the client easily
-def get_supabase_client() -> Client:
+async def get_supabase_client() -> Client:
     """
     Dependency function to get Supabase client.
+
+    Async so FastAPI resolves it on the event loop directly instead of
+    submitting it to the threadpool on every request.
     """
     return DatabaseClient.get_client()
 
 
-# For convenience, create a global instance
-supabase_client = get_supabase_client()
\ No newline at end of file
+async def run_db(query: Any) -> Any:
+    """
+    Execute a sync PostgREST/storage query builder off the event loop.
+
+    The pinned supabase-py client is requests-based, so awaiting this
+    instead of calling .execute() inline keeps async route handlers from
+    blocking the loop during DB round-trips.
+    """
+    return await asyncio.to_thread(query.execute)
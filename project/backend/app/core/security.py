@@ -1,8 +1,11 @@
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+import hashlib
+import threading
+import time
 
 
 # Password hashing context
@@ -63,6 +66,34 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     return encoded_jwt
 
 
+def create_token_pair(data: Dict[str, Any]) -> Tuple[str, str]:
+    """
+    Create an access and refresh token from one base payload.
+
+    Login and refresh always mint both tokens together; building the
+    shared claims and timestamp once avoids duplicating that work per
+    call. With HS256 there is no key parsing to cache - the secret is
+    fed to the HMAC directly - so the two signs are the whole cost.
+    """
+    now = datetime.utcnow()
+
+    access_claims = dict(data)
+    access_claims.update({
+        "exp": now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        "type": "access",
+    })
+    refresh_claims = dict(data)
+    refresh_claims.update({
+        "exp": now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        "type": "refresh",
+    })
+
+    return (
+        jwt.encode(access_claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM),
+        jwt.encode(refresh_claims, settings.SECRET_KEY, algorithm=settings.ALGORITHM),
+    )
+
+
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
     """
     Verify and decode a JWT token.
@@ -86,6 +117,47 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
         return None
 
 
+# Short-lived cache of verified token payloads (opt-in via
+# JWT_CACHE_ENABLED). Keyed by the token's SHA-256 digest so raw tokens are
+# never held in memory; failures are never cached.
+_token_cache: Dict[bytes, Tuple[Dict[str, Any], float]] = {}
+_token_cache_lock = threading.Lock()
+
+
+def verify_token_cached(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
+    """
+    TTL-cached wrapper around verify_token for hot auth paths.
+
+    On a cache hit the token is not re-decoded; the cached exp claim is
+    still enforced, and entries never outlive the token itself.
+    """
+    if not settings.JWT_CACHE_ENABLED:
+        return verify_token(token, token_type)
+
+    key = hashlib.sha256(f"{token_type}:{token}".encode()).digest()
+    now = time.time()
+
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            payload, cached_until = entry
+            if now < cached_until and now < payload.get("exp", 0):
+                return payload
+            del _token_cache[key]
+
+    payload = verify_token(token, token_type)
+
+    if payload is not None:
+        ttl = min(settings.JWT_CACHE_TTL_SECONDS, payload.get("exp", now) - now)
+        if ttl > 0:
+            with _token_cache_lock:
+                if len(_token_cache) >= settings.JWT_CACHE_MAX_SIZE:
+                    _token_cache.clear()
+                _token_cache[key] = (payload, now + ttl)
+
+    return payload
+
+
 def decode_token(token: str) -> Optional[str]:
     """
     Decode token and return user_id.
@@ -1,31 +1,84 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager
 from app.core.config import settings
 from app.api.v1 import api_router
+from app.services.auth_service import AuthError
+from app.core.database import DatabaseClient
+import logging
+import os
+
+
+# Configure root logging once; per-module loggers (logging.getLogger(
+# __name__)) inherit this level, so debug logging can be switched off in
+# production without touching code
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"))
+logger = logging.getLogger(__name__)
+
+
+# Prefer uvloop for the event loop regardless of how uvicorn is invoked;
+# it is a drop-in asyncio replacement that is markedly faster for the
+# IO-heavy workload here (not available on Windows dev machines)
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Initialize shared clients at startup instead of import time, so
+    merely importing app modules (tests, forked workers) doesn't open
+    connections to Supabase.
+    """
+    DatabaseClient.get_client()
+    logger.info("%s starting (environment: %s), docs at /docs",
+                settings.PROJECT_NAME, settings.ENVIRONMENT)
+    yield
+    logger.info("%s shutting down", settings.PROJECT_NAME)
 
 
 # Create FastAPI app
 app = FastAPI(
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     description="Software Bill of Materials (SBOM) Management System API",
     docs_url="/docs",  # Swagger UI
     redoc_url="/redoc",  # ReDoc UI
+    default_response_class=ORJSONResponse,  # orjson is ~3x faster than stdlib json
 )
 
-# Configure CORS
+# Configure CORS - explicit origins (wildcard + credentials is rejected
+# by browsers anyway), explicit methods, and a 24h preflight cache so
+# returning clients skip the OPTIONS round-trip
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(dict.fromkeys(settings.ALLOWED_ORIGINS)),
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
     allow_headers=["*"],
+    max_age=86400,
 )
 
 # Include API routers
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+@app.exception_handler(AuthError)
+async def auth_error_handler(request, exc: AuthError):
+    """Map typed auth-service failures to HTTP responses in one place."""
+    headers = {"WWW-Authenticate": "Bearer"} if exc.status_code == 401 else None
+    return ORJSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc)},
+        headers=headers,
+    )
+
+
 @app.get("/")
 async def root():
     """Root endpoint - API information."""
@@ -45,19 +98,3 @@ async def health_check():
         "status": "healthy",
         "environment": settings.ENVIRONMENT
     }
-
-
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Run on application startup."""
-    print(f"{settings.PROJECT_NAME} starting...")
-    print(f"Documentation available at: /docs")
-    print(f"Environment: {settings.ENVIRONMENT}")
-
-
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Run on application shutdown."""
-    print(f"{settings.PROJECT_NAME} shutting down...")
\ No newline at end of file
@@ -1,7 +1,44 @@
-from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from pydantic import AfterValidator, BaseModel, EmailStr, Field
+from typing import Annotated, Optional
 from datetime import datetime
-import re
+
+
+def _validate_password_strength(v: str) -> str:
+    """
+    Shared password-strength check for all password fields.
+
+    Classifies characters in a single pass instead of running separate
+    regex scans per character class.
+    """
+    if len(v) < 8:
+        raise ValueError('Password must be at least 8 characters long')
+
+    has_upper = has_lower = has_digit = False
+    for c in v:
+        if 'A' <= c <= 'Z':
+            has_upper = True
+        elif 'a' <= c <= 'z':
+            has_lower = True
+        elif c.isdigit():
+            has_digit = True
+
+    if not has_upper:
+        raise ValueError('Password must contain at least one uppercase letter')
+    if not has_lower:
+        raise ValueError('Password must contain at least one lowercase letter')
+    if not has_digit:
+        raise ValueError('Password must contain at least one number')
+
+    return v
+
+
+# Validated in compiled pydantic-core schema rather than a per-model
+# @validator, and shared by every password-bearing model
+StrongPassword = Annotated[
+    str,
+    Field(min_length=8, max_length=100),
+    AfterValidator(_validate_password_strength),
+]
 
 
 class UserBase(BaseModel):
@@ -12,26 +49,7 @@ class UserBase(BaseModel):
 
 class UserCreate(UserBase):
     """Model for user registration."""
-    password: str = Field(..., min_length=8, max_length=100)
-    
-    @validator('password')
-    def validate_password(cls, v):
-        """
-        Validate password strength.
-        """
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain at least one number')
-        
-        return v
+    password: StrongPassword
 
 
 class UserLogin(BaseModel):
@@ -70,19 +88,7 @@ class PasswordReset(BaseModel):
 
 class PasswordResetConfirm(BaseModel):
     token: str
-    new_password: str
-    
-    @validator('new_password')
-    def validate_password(cls, v):
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if not any(char.isdigit() for char in v):
-            raise ValueError('Password must contain at least one digit')
-        if not any(char.isupper() for char in v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        if not any(char.islower() for char in v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        return v
+    new_password: StrongPassword
 
 
 class UserUpdate(BaseModel):
@@ -94,21 +100,4 @@ class UserUpdate(BaseModel):
 class PasswordChange(BaseModel):
     """Model for password change."""
     old_password: str
-    new_password: str = Field(..., min_length=8, max_length=100)
-    
-    @validator('new_password')
-    def validate_password(cls, v):
-        """Validate password strength."""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        
-        if not re.search(r'[A-Z]', v):
-            raise ValueError('Password must contain at least one uppercase letter')
-        
-        if not re.search(r'[a-z]', v):
-            raise ValueError('Password must contain at least one lowercase letter')
-        
-        if not re.search(r'\d', v):
-            raise ValueError('Password must contain at least one number')
-        
-        return v
\ No newline at end of file
+    new_password: StrongPassword
\ No newline at end of file
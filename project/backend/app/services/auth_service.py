@@ -1,10 +1,67 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from supabase import Client
-from app.core.security import create_access_token, create_refresh_token, verify_token
+from app.core.security import create_token_pair, verify_token
 from app.models.user import UserCreate, UserLogin, UserResponse, Token
 from datetime import timedelta
 from app.core.config import settings
 from app.services.password_reset_service import PasswordResetService
+import asyncio
+import re
+import threading
+import time
+
+
+# Compiled once; classifying Supabase error strings with .search avoids
+# lowercasing a copy of the message per substring check on every failed
+# attempt (the login path sees plenty under brute-force traffic)
+_ERR_DUPLICATE = re.compile(r"already registered|already exists", re.IGNORECASE)
+_ERR_INVALID = re.compile(r"invalid|credentials", re.IGNORECASE)
+
+
+# Admin user lookups hit the Supabase Auth Admin API (~50-200ms); cache
+# the raw user object briefly so back-to-back authenticated requests for
+# the same user resolve in-process
+_USER_CACHE_TTL = 60.0
+_USER_CACHE_MAX = 10000
+_user_cache: Dict[str, Tuple[Any, float]] = {}
+_user_cache_lock = threading.Lock()
+
+# Single-flight on cache misses: concurrent lookups for the same user
+# (several tabs refreshing at once) await one in-flight Admin API call
+# instead of each issuing their own. Event-loop only, so a plain dict.
+_user_inflight: Dict[str, "asyncio.Future"] = {}
+
+
+def invalidate_user_cache(user_id: str) -> None:
+    """Drop a cached admin user lookup (e.g. after a password reset)."""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
+
+
+class AuthError(Exception):
+    """
+    Base class for auth failures.
+
+    Mapped to an HTTP response by a single exception handler in main.py,
+    so the routers don't need per-endpoint try/except wrappers.
+    """
+    status_code = 400
+
+
+class RegistrationError(AuthError):
+    status_code = 400
+
+
+class InvalidCredentialsError(AuthError):
+    status_code = 401
+
+
+class TokenRefreshError(AuthError):
+    status_code = 401
+
+
+class UserNotFoundError(AuthError):
+    status_code = 404
 
 
 class AuthService:
@@ -16,14 +73,58 @@ class AuthService:
         """
         self.client = supabase_client
         self.password_reset_service = PasswordResetService(supabase_client)
+
+    async def _fetch_user(self, user_id: str) -> Optional[Any]:
+        """
+        Get a Supabase auth user by id with a short in-process cache.
+
+        The blocking Admin API call runs off the event loop; the raw user
+        object is cached so refresh_token and get_current_user share
+        entries.
+        """
+        now = time.time()
+        with _user_cache_lock:
+            entry = _user_cache.get(user_id)
+            if entry is not None:
+                user, expires_at = entry
+                if now < expires_at:
+                    return user
+                del _user_cache[user_id]
+
+        # Join an in-flight fetch for the same user if one exists
+        inflight = _user_inflight.get(user_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        _user_inflight[user_id] = future
+        try:
+            response = await asyncio.to_thread(
+                self.client.auth.admin.get_user_by_id, user_id
+            )
+            user = response.user
+            if user is not None:
+                with _user_cache_lock:
+                    if len(_user_cache) >= _USER_CACHE_MAX:
+                        _user_cache.clear()
+                    _user_cache[user_id] = (user, now + _USER_CACHE_TTL)
+            future.set_result(user)
+            return user
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved even with no waiters
+            raise
+        finally:
+            del _user_inflight[user_id]
     
     async def register(self, user_data: UserCreate) -> Dict[str, Any]:
         """
         Register a new user.
         """
         try:
-            # Register user with Supabase Auth
-            response = self.client.auth.sign_up({
+            # Register user with Supabase Auth (blocking SDK call, so run
+            # off the event loop)
+            response = await asyncio.to_thread(self.client.auth.sign_up, {
                 "email": user_data.email,
                 "password": user_data.password,
                 "options": {
@@ -34,7 +135,7 @@ class AuthService:
             })
             
             if response.user is None:
-                raise Exception("Registration failed")
+                raise RegistrationError("Registration failed")
             
             return {
                 "message": "Registration successful. Please check your email to verify your account.",
@@ -46,35 +147,37 @@ class AuthService:
                 }
             }
             
+        except AuthError:
+            raise
         except Exception as e:
             error_msg = str(e)
-            if "already registered" in error_msg.lower() or "already exists" in error_msg.lower():
-                raise Exception("User with this email already exists")
-            raise Exception(f"Registration failed: {error_msg}")
+            if _ERR_DUPLICATE.search(error_msg):
+                raise RegistrationError("User with this email already exists")
+            raise RegistrationError(f"Registration failed: {error_msg}")
     
     async def login(self, credentials: UserLogin) -> Token:
         """
         Login user and return tokens.
         """
         try:
-            # Sign in with Supabase Auth
-            response = self.client.auth.sign_in_with_password({
-                "email": credentials.email,
-                "password": credentials.password
-            })
+            # Sign in with Supabase Auth (off-loop; bcrypt verification
+            # server-side makes this one of the slower upstream calls)
+            response = await asyncio.to_thread(
+                self.client.auth.sign_in_with_password,
+                {
+                    "email": credentials.email,
+                    "password": credentials.password
+                }
+            )
             
             if response.user is None or response.session is None:
-                raise Exception("Invalid credentials")
+                raise InvalidCredentialsError("Invalid email or password")
             
             user = response.user
             
             # Create custom JWT tokens
-            access_token = create_access_token(
-                data={"sub": user.id, "email": user.email}
-            )
-            
-            refresh_token = create_refresh_token(
-                data={"sub": user.id, "email": user.email}
+            access_token, refresh_token = create_token_pair(
+                {"sub": user.id, "email": user.email}
             )
             
             # Get user metadata
@@ -93,11 +196,13 @@ class AuthService:
                 )
             )
             
+        except AuthError:
+            raise
         except Exception as e:
             error_msg = str(e)
-            if "invalid" in error_msg.lower() or "credentials" in error_msg.lower():
-                raise Exception("Invalid email or password")
-            raise Exception(f"Login failed: {error_msg}")
+            if _ERR_INVALID.search(error_msg):
+                raise InvalidCredentialsError("Invalid email or password")
+            raise InvalidCredentialsError(f"Login failed: {error_msg}")
     
     async def refresh_token(self, refresh_token: str) -> Token:
         """
@@ -108,29 +213,23 @@ class AuthService:
             payload = verify_token(refresh_token, token_type="refresh")
             
             if payload is None:
-                raise Exception("Invalid or expired refresh token")
+                raise TokenRefreshError("Invalid or expired refresh token")
             
             user_id = payload.get("sub")
             email = payload.get("email")
             
             if not user_id or not email:
-                raise Exception("Invalid token payload")
+                raise TokenRefreshError("Invalid token payload")
             
-            # Get user info from Supabase using Admin API
-            user_response = self.client.auth.admin.get_user_by_id(user_id)
-            
-            if user_response.user is None:
-                raise Exception("User not found")
-            
-            user = user_response.user
+            # Get user info from Supabase (cached admin lookup)
+            user = await self._fetch_user(user_id)
+
+            if user is None:
+                raise TokenRefreshError("User not found")
             
             # Create new tokens
-            new_access_token = create_access_token(
-                data={"sub": user.id, "email": user.email}
-            )
-            
-            new_refresh_token = create_refresh_token(
-                data={"sub": user.id, "email": user.email}
+            new_access_token, new_refresh_token = create_token_pair(
+                {"sub": user.id, "email": user.email}
             )
             
             user_metadata = user.user_metadata or {}
@@ -148,21 +247,21 @@ class AuthService:
                 )
             )
             
+        except AuthError:
+            raise
         except Exception as e:
-            raise Exception(f"Token refresh failed: {str(e)}")
+            raise TokenRefreshError(f"Token refresh failed: {str(e)}")
     
     async def get_current_user(self, user_id: str) -> UserResponse:
         """
         Get current user from user ID.
         """
         try:
-            # Use Admin API to get user by ID
-            response = self.client.auth.admin.get_user_by_id(user_id)
-            
-            if response.user is None:
-                raise Exception("User not found")
-            
-            user = response.user
+            # Cached Admin API lookup
+            user = await self._fetch_user(user_id)
+
+            if user is None:
+                raise UserNotFoundError("User not found")
             user_metadata = user.user_metadata or {}
             
             return UserResponse(
@@ -173,8 +272,10 @@ class AuthService:
                 created_at=user.created_at
             )
             
+        except AuthError:
+            raise
         except Exception as e:
-            raise Exception(f"Failed to get user: {str(e)}")
+            raise UserNotFoundError(f"Failed to get user: {str(e)}")
     
     async def request_password_reset(self, email: str) -> Dict[str, str]:
         """Request password reset via Supabase"""
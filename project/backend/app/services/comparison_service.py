@@ -1,13 +1,55 @@
-from typing import Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from app.models.comparison import (
-    ComparisonResult, 
-    ComparisonSummary, 
+    ComparisonResult,
+    ComparisonSummary,
     ComponentDifference
 )
+from app.core.database import run_db
 from supabase import Client
+import asyncio
+import threading
+import time
 import uuid
 from datetime import datetime
 
+
+# Applications and their component lists only change on ingestion, but a
+# comparison-heavy UI re-fetches them constantly. Entries are served for
+# TTL seconds; after that the stale value is returned immediately while
+# a background task refreshes it (stale-while-revalidate). Uploads and
+# deletes invalidate through invalidate_comparison_cache.
+_CACHE_TTL = 300.0
+_CACHE_MAX = 2000
+_cache: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+_cache_lock = threading.Lock()
+_refreshing: set = set()
+
+# Strong references to in-flight refresh tasks; the loop only holds weak
+# ones, so an unreferenced task could be garbage-collected mid-refresh
+_refresh_tasks: set = set()
+
+# Metadata-only application columns; the comparison never touches the
+# multi-MB sbom_data/spdx_data blobs
+_APP_METADATA_COLUMNS = (
+    "id, user_id, name, original_filename, file_size, file_hash, "
+    "storage_path, platform, status, component_count, sbom_format, "
+    "error_message, analyzed_at, created_at"
+)
+
+
+def invalidate_comparison_cache(app_id: str) -> None:
+    """Drop cached comparison fetches for an application."""
+    with _cache_lock:
+        for key in [k for k in _cache if k[1].endswith(app_id)]:
+            del _cache[key]
+
+
+def _cache_put(key: Tuple[str, str], value: Any) -> None:
+    with _cache_lock:
+        if len(_cache) >= _CACHE_MAX:
+            _cache.clear()
+        _cache[key] = (value, time.time() + _CACHE_TTL)
+
 class ComparisonService:
     def __init__(self, supabase_client: Client):
         self.supabase = supabase_client
@@ -21,13 +63,16 @@ class ComparisonService:
         """
         Compare two applications and return detailed differences.
         """
-        # Fetch both applications
-        app1 = await self._get_application(app1_id, user_id)
-        app2 = await self._get_application(app2_id, user_id)
-        
-        # Fetch components for both apps
-        app1_components = await self._get_components(app1_id)
-        app2_components = await self._get_components(app2_id)
+        # Warm cache: serve everything in-process (stale entries refresh
+        # in the background). Otherwise fetch the whole dataset - both
+        # app rows and both component lists - in one server-side-joined
+        # RPC, with the per-entity queries as fallback.
+        dataset = self._peek_cached(app1_id, app2_id, user_id)
+        if dataset is None:
+            dataset = await self._fetch_dataset(app1_id, app2_id, user_id)
+        app1, app2, components_by_app = dataset
+        app1_components = components_by_app.get(app1_id, [])
+        app2_components = components_by_app.get(app2_id, [])
         
         # Perform comparison
         comparison_data = self._perform_comparison(
@@ -54,14 +99,193 @@ class ComparisonService:
             created_at=datetime.utcnow()
         )
     
+    def _peek_cached(
+        self,
+        app1_id: str,
+        app2_id: str,
+        user_id: str
+    ) -> Optional[Tuple[Dict, Dict, Dict[str, List[Dict]]]]:
+        """
+        Return the full comparison dataset if every piece is cached.
+
+        Stale entries are still served; a background refresh is spawned
+        for each. Any missing piece returns None so the caller fetches
+        the whole dataset at once.
+        """
+        now = time.time()
+        keys = [
+            ("app", f"{user_id}:{app1_id}"),
+            ("app", f"{user_id}:{app2_id}"),
+            ("comps", app1_id),
+            ("comps", app2_id),
+        ]
+        with _cache_lock:
+            entries = [_cache.get(key) for key in keys]
+
+        if any(entry is None for entry in entries):
+            return None
+
+        fetches = [
+            lambda: self._get_application(app1_id, user_id),
+            lambda: self._get_application(app2_id, user_id),
+            lambda: self._get_components(app1_id),
+            lambda: self._get_components(app2_id),
+        ]
+        values = []
+        for key, (value, fresh_until), fetch in zip(keys, entries, fetches):
+            if now >= fresh_until:
+                self._spawn_refresh(key, fetch)
+            values.append(value)
+
+        app1, app2, comps1, comps2 = values
+        return app1, app2, {app1_id: comps1, app2_id: comps2}
+
+    async def _fetch_dataset(
+        self,
+        app1_id: str,
+        app2_id: str,
+        user_id: str
+    ) -> Tuple[Dict, Dict, Dict[str, List[Dict]]]:
+        """
+        Fetch both apps and their components, preferring one RPC.
+
+        get_comparison_dataset joins applications, application_components
+        and components server-side and returns everything in a single
+        round-trip; until the function is deployed, the per-entity
+        cached fetches run concurrently instead.
+        """
+        try:
+            response = await run_db(self.supabase.rpc("get_comparison_dataset", {
+                "p_app1": app1_id,
+                "p_app2": app2_id,
+                "p_user_id": user_id,
+            }))
+            data = response.data
+            if data is not None:
+                apps = data.get("apps") or {}
+                for app_id in (app1_id, app2_id):
+                    if app_id not in apps:
+                        raise ValueError(f"Application {app_id} not found")
+                components = data.get("components") or {}
+                components_by_app = {
+                    app_id: components.get(app_id) or []
+                    for app_id in (app1_id, app2_id)
+                }
+                for app_id in (app1_id, app2_id):
+                    _cache_put(("app", f"{user_id}:{app_id}"), apps[app_id])
+                    _cache_put(("comps", app_id), components_by_app[app_id])
+                return apps[app1_id], apps[app2_id], components_by_app
+        except ValueError:
+            raise
+        except Exception:
+            pass
+
+        app1, app2, components_by_app = await asyncio.gather(
+            self._swr(
+                ("app", f"{user_id}:{app1_id}"),
+                lambda: self._get_application(app1_id, user_id),
+            ),
+            self._swr(
+                ("app", f"{user_id}:{app2_id}"),
+                lambda: self._get_application(app2_id, user_id),
+            ),
+            self._get_components_cached([app1_id, app2_id]),
+        )
+        return app1, app2, components_by_app
+
+    async def _swr(
+        self,
+        key: Tuple[str, str],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Serve from the cache, refreshing stale entries in the background.
+
+        Misses block on the fetch; stale hits return immediately while a
+        task revalidates, so a warm cache never waits on Supabase.
+        """
+        now = time.time()
+        with _cache_lock:
+            entry = _cache.get(key)
+
+        if entry is None:
+            value = await fetch()
+            _cache_put(key, value)
+            return value
+
+        value, fresh_until = entry
+        if now >= fresh_until:
+            self._spawn_refresh(key, fetch)
+        return value
+
+    def _spawn_refresh(
+        self,
+        key: Tuple[str, str],
+        fetch: Callable[[], Awaitable[Any]]
+    ) -> None:
+        """Revalidate one cache entry at most once at a time."""
+        with _cache_lock:
+            if key in _refreshing:
+                return
+            _refreshing.add(key)
+
+        async def _refresh():
+            try:
+                _cache_put(key, await fetch())
+            except Exception:
+                # Refresh failed (e.g. app deleted); drop the stale entry
+                # so the next request fetches and errors visibly
+                with _cache_lock:
+                    _cache.pop(key, None)
+            finally:
+                with _cache_lock:
+                    _refreshing.discard(key)
+
+        task = asyncio.create_task(_refresh())
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
+    async def _get_components_cached(
+        self,
+        app_ids: List[str]
+    ) -> Dict[str, List[Dict]]:
+        """Component lists via the cache; only misses hit the bulk query."""
+        now = time.time()
+        result: Dict[str, List[Dict]] = {}
+        missing: List[str] = []
+
+        with _cache_lock:
+            entries = {app_id: _cache.get(("comps", app_id)) for app_id in app_ids}
+
+        for app_id, entry in entries.items():
+            if entry is None:
+                missing.append(app_id)
+                continue
+            value, fresh_until = entry
+            result[app_id] = value
+            if now >= fresh_until:
+                self._spawn_refresh(
+                    ("comps", app_id),
+                    lambda app_id=app_id: self._get_components(app_id),
+                )
+
+        if missing:
+            fetched = await self._get_components_bulk(missing)
+            for app_id, comps in fetched.items():
+                _cache_put(("comps", app_id), comps)
+                result[app_id] = comps
+
+        return result
+
     async def _get_application(self, app_id: str, user_id: str) -> Dict:
         """Fetch application details."""
-        response = self.supabase.table("applications")\
-            .select("*")\
-            .eq("id", app_id)\
-            .eq("user_id", user_id)\
-            .single()\
-            .execute()
+        response = await run_db(
+            self.supabase.table("applications")
+            .select(_APP_METADATA_COLUMNS)
+            .eq("id", app_id)
+            .eq("user_id", user_id)
+            .single()
+        )
         
         if not response.data:
             raise ValueError(f"Application {app_id} not found")
@@ -70,18 +294,29 @@ class ComparisonService:
     
     async def _get_components(self, app_id: str) -> List[Dict]:
         """Fetch components for an application."""
-        response = self.supabase.table("application_components")\
-            .select("component_id, components(*)")\
-            .eq("application_id", app_id)\
-            .execute()
-        
-        components = []
+        response = await run_db(
+            self.supabase.table("application_components")
+            .select("component_id, components(name, version, type, license)")
+            .eq("application_id", app_id)
+        )
+
+        return [item['components'] for item in response.data if item.get('components')]
+
+    async def _get_components_bulk(self, app_ids: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch components for several applications in one query."""
+        response = await run_db(
+            self.supabase.table("application_components")
+            .select("application_id, component_id, components(name, version, type, license)")
+            .in_("application_id", app_ids)
+        )
+
+        by_app: Dict[str, List[Dict]] = {app_id: [] for app_id in app_ids}
         for item in response.data:
             comp = item['components']
             if comp:
-                components.append(comp)
-        
-        return components
+                by_app[item['application_id']].append(comp)
+
+        return by_app
     
     def _perform_comparison(
         self, 
@@ -92,84 +327,89 @@ class ComparisonService:
     ) -> Dict:
         """Core comparison logic."""
         
-        # Create lookup dictionaries
+        # Create lookup dictionaries. Keys are single strings (name and
+        # type joined on a unit separator) rather than tuples: one hash
+        # per lookup and no per-component tuple allocation, which adds up
+        # on multi-thousand-component SBOMs
         app1_comp_map = {
-            (c['name'], c['type']): c for c in app1_components
+            f"{c['name']}\x1f{c['type']}": c for c in app1_components
         }
         app2_comp_map = {
-            (c['name'], c['type']): c for c in app2_components
+            f"{c['name']}\x1f{c['type']}": c for c in app2_components
         }
         
+        # Partition keys with C-level set operations on the dict views
+        # instead of per-item membership tests in Python loops
+        common_keys = app1_comp_map.keys() & app2_comp_map.keys()
+        only_app1 = app1_comp_map.keys() - app2_comp_map.keys()
+        only_app2 = app2_comp_map.keys() - app1_comp_map.keys()
+
         common_components = []
         differences = []
-        
-        # Find common and version differences
-        for key, comp1 in app1_comp_map.items():
-            if key in app2_comp_map:
-                comp2 = app2_comp_map[key]
-                
-                # Check if versions differ
-                if comp1['version'] != comp2['version']:
-                    differences.append(ComponentDifference(
-                        component_name=comp1['name'],
-                        app1_version=comp1['version'],
-                        app2_version=comp2['version'],
-                        difference_type='version',
-                        license_diff=comp1.get('license') != comp2.get('license'),
-                        app1_license=comp1.get('license'),
-                        app2_license=comp2.get('license')
-                    ))
-                else:
-                    common_components.append({
-                        'name': comp1['name'],
-                        'version': comp1['version'],
-                        'type': comp1['type'],
-                        'license': comp1.get('license')
-                    })
-        
-        # Find components unique to app1
-        unique_to_app1 = []
-        for key, comp in app1_comp_map.items():
-            if key not in app2_comp_map:
-                differences.append(ComponentDifference(
-                    component_name=comp['name'],
-                    app1_version=comp['version'],
-                    app2_version=None,
-                    difference_type='removed',
-                    app1_license=comp.get('license')
-                ))
-                unique_to_app1.append(comp)
-        
-        # Find components unique to app2
-        unique_to_app2 = []
-        for key, comp in app2_comp_map.items():
-            if key not in app1_comp_map:
+        version_diff_count = 0
+        license_diffs = 0
+
+        # Common components: same version or a version difference
+        for key in common_keys:
+            comp1 = app1_comp_map[key]
+            comp2 = app2_comp_map[key]
+
+            if comp1['version'] != comp2['version']:
+                license_diff = comp1.get('license') != comp2.get('license')
                 differences.append(ComponentDifference(
-                    component_name=comp['name'],
-                    app1_version=None,
-                    app2_version=comp['version'],
-                    difference_type='added',
-                    app2_license=comp.get('license')
+                    component_name=comp1['name'],
+                    app1_version=comp1['version'],
+                    app2_version=comp2['version'],
+                    difference_type='version',
+                    license_diff=license_diff,
+                    app1_license=comp1.get('license'),
+                    app2_license=comp2.get('license')
                 ))
-                unique_to_app2.append(comp)
-        
+                version_diff_count += 1
+                if license_diff:
+                    license_diffs += 1
+            else:
+                common_components.append({
+                    'name': comp1['name'],
+                    'version': comp1['version'],
+                    'type': comp1['type'],
+                    'license': comp1.get('license')
+                })
+
+        # Components unique to app1
+        unique_to_app1 = [app1_comp_map[key] for key in only_app1]
+        for comp in unique_to_app1:
+            differences.append(ComponentDifference(
+                component_name=comp['name'],
+                app1_version=comp['version'],
+                app2_version=None,
+                difference_type='removed',
+                app1_license=comp.get('license')
+            ))
+
+        # Components unique to app2
+        unique_to_app2 = [app2_comp_map[key] for key in only_app2]
+        for comp in unique_to_app2:
+            differences.append(ComponentDifference(
+                component_name=comp['name'],
+                app1_version=None,
+                app2_version=comp['version'],
+                difference_type='added',
+                app2_license=comp.get('license')
+            ))
+
         # Calculate similarity
         total_unique = len(app1_comp_map) + len(app2_comp_map)
         if total_unique > 0:
             similarity = (2 * len(common_components)) / total_unique * 100
         else:
             similarity = 0.0
-        
-        # Count license differences
-        license_diffs = sum(1 for d in differences if d.license_diff)
-        
+
         summary = ComparisonSummary(
             total_common=len(common_components),
             total_unique_app1=len(unique_to_app1),
             total_unique_app2=len(unique_to_app2),
-            total_version_differences=sum(
-                1 for d in differences if d.difference_type == 'version'
-            ),
+            total_version_differences=version_diff_count,
             similarity_percentage=round(similarity, 2),
             license_differences=license_diffs
         )
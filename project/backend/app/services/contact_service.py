@@ -1,12 +1,86 @@
 from supabase import Client
 from typing import Dict
 from datetime import datetime
+from html import escape
+from string import Template
+import asyncio
 import resend
 from app.core.config import settings
+from app.core.database import run_db
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+# Compiled once at import instead of rebuilding the ~2KB HTML body via
+# f-string on every send; values are HTML-escaped before substitution so
+# form input can't inject markup into the notification email
+_CONTACT_EMAIL_TMPL = Template("""
+<html>
+  <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+    <div style="max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f9f9f9;">
+      <div style="background-color: #5B6FB5; color: white; padding: 20px; border-radius: 8px 8px 0 0;">
+        <h2 style="margin: 0;">📬 New Contact Form Submission</h2>
+      </div>
+      <div style="background-color: white; padding: 30px; border-radius: 0 0 8px 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+        <table style="width: 100%; border-collapse: collapse;">
+          <tr>
+            <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
+              <strong>Category:</strong>
+            </td>
+            <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
+              <span style="background-color: #5B6FB5; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px;">
+                $category
+              </span>
+            </td>
+          </tr>
+          <tr>
+            <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
+              <strong>From:</strong>
+            </td>
+            <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
+              $user_email
+            </td>
+          </tr>
+          <tr>
+            <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
+              <strong>Subject:</strong>
+            </td>
+            <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
+              $subject
+            </td>
+          </tr>
+        </table>
+        <div style="margin-top: 30px; padding: 20px; background-color: #f9f9f9; border-left: 4px solid #5B6FB5; border-radius: 4px;">
+          <strong style="display: block; margin-bottom: 10px;">Message:</strong>
+          <div style="white-space: pre-wrap; word-wrap: break-word;">
+            $message
+          </div>
+        </div>
+        <div style="margin-top: 30px; padding: 15px; background-color: #e8f4f8; border-radius: 4px; text-align: center; font-size: 12px; color: #666;">
+          💡 <strong>Reply to:</strong> $user_email
+        </div>
+      </div>
+      <div style="margin-top: 20px; text-align: center; font-size: 12px; color: #999;">
+        <p>This email was sent from your SBOM Manager contact form</p>
+      </div>
+    </div>
+  </body>
+</html>
+""")
+
+
+# Strong references to in-flight email tasks; the loop only holds weak
+# ones, so an unreferenced task could be garbage-collected mid-send
+_email_tasks: set = set()
+
+
+def _log_email_result(task: asyncio.Task) -> None:
+    """Surface background email failures; they must not fail the request."""
+    exc = task.exception()
+    if exc is not None:
+        logger.error(f"Failed to send email notification: {exc}")
+
 class ContactService:
     def __init__(self, client: Client):
         self.client = client
@@ -37,19 +111,24 @@ class ContactService:
                 "created_at": datetime.utcnow().isoformat()
             }
             
-            response = self.client.table("contacts").insert(contact_data).execute()
-            
+            response = await run_db(self.client.table("contacts").insert(contact_data))
+
             if not response.data:
                 raise Exception("Failed to save contact message")
-            
-            # Try to send email via Resend
-            try:
-                self._send_email(category, subject, message, user_email)
-                logger.info(f"Email sent successfully for contact {response.data[0]['id']}")
-            except Exception as email_error:
-                logger.error(f"Failed to send email notification: {email_error}")
-                # Don't crash - just log
-            
+
+            # Send the notification email in the background; the message
+            # is already persisted, so the response doesn't need to wait
+            # out the Resend round-trip. Failures are logged by the done
+            # callback (same behavior as the old inline try/except).
+            task = asyncio.create_task(
+                asyncio.to_thread(
+                    self._send_email, category, subject, message, user_email
+                )
+            )
+            _email_tasks.add(task)
+            task.add_done_callback(_email_tasks.discard)
+            task.add_done_callback(_log_email_result)
+
             return {
                 "message": "Your message has been sent successfully!",
                 "contact_id": response.data[0]["id"]
@@ -61,60 +140,13 @@ class ContactService:
     def _send_email(self, category: str, subject: str, message: str, user_email: str):
         """Send email using Resend API."""
         try:
-            html_content = f"""
-            <html>
-              <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
-                <div style="max-width: 600px; margin: 0 auto; padding: 20px; background-color: #f9f9f9;">
-                  <div style="background-color: #5B6FB5; color: white; padding: 20px; border-radius: 8px 8px 0 0;">
-                    <h2 style="margin: 0;">📬 New Contact Form Submission</h2>
-                  </div>
-                  <div style="background-color: white; padding: 30px; border-radius: 0 0 8px 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
-                    <table style="width: 100%; border-collapse: collapse;">
-                      <tr>
-                        <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
-                          <strong>Category:</strong>
-                        </td>
-                        <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
-                          <span style="background-color: #5B6FB5; color: white; padding: 4px 12px; border-radius: 12px; font-size: 12px;">
-                            {category.upper()}
-                          </span>
-                        </td>
-                      </tr>
-                      <tr>
-                        <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
-                          <strong>From:</strong>
-                        </td>
-                        <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
-                          {user_email}
-                        </td>
-                      </tr>
-                      <tr>
-                        <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
-                          <strong>Subject:</strong>
-                        </td>
-                        <td style="padding: 10px 0; border-bottom: 1px solid #eee;">
-                          {subject}
-                        </td>
-                      </tr>
-                    </table>
-                    <div style="margin-top: 30px; padding: 20px; background-color: #f9f9f9; border-left: 4px solid #5B6FB5; border-radius: 4px;">
-                      <strong style="display: block; margin-bottom: 10px;">Message:</strong>
-                      <div style="white-space: pre-wrap; word-wrap: break-word;">
-                        {message}
-                      </div>
-                    </div>
-                    <div style="margin-top: 30px; padding: 15px; background-color: #e8f4f8; border-radius: 4px; text-align: center; font-size: 12px; color: #666;">
-                      💡 <strong>Reply to:</strong> {user_email}
-                    </div>
-                  </div>
-                  <div style="margin-top: 20px; text-align: center; font-size: 12px; color: #999;">
-                    <p>This email was sent from your SBOM Manager contact form</p>
-                  </div>
-                </div>
-              </body>
-            </html>
-            """
-            
+            html_content = _CONTACT_EMAIL_TMPL.substitute(
+                category=escape(category.upper()),
+                user_email=escape(user_email),
+                subject=escape(subject),
+                message=escape(message),
+            )
+
             # Send email via Resend
             params = {
                 "from": self.from_email,
@@ -1,11 +1,21 @@
 from supabase import Client
+from types import MappingProxyType
 from typing import Dict
+import asyncio
 import logging
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+# Deliberately identical for success and failure (no account
+# enumeration); built once and immutable so neither branch allocates or
+# can accidentally mutate it
+_RESET_REQUESTED_RESPONSE = MappingProxyType({
+    "message": "If an account exists with this email, a password reset link has been sent."
+})
+
+
 class PasswordResetService:
     def __init__(self, client: Client):
         self.client = client
@@ -20,7 +30,10 @@ class PasswordResetService:
             # Ensure redirect_to doesn't have trailing slash
             redirect_url = f"{settings.FRONTEND_URL}/auth/callback"
             
-            response = self.client.auth.reset_password_email(
+            # Blocking SDK call; keep the event loop free while Supabase
+            # sends the email
+            response = await asyncio.to_thread(
+                self.client.auth.reset_password_email,
                 email,
                 {
                     "redirect_to": redirect_url
@@ -29,16 +42,12 @@ class PasswordResetService:
             
             logger.info(f"Password reset email sent via Supabase to {email}")
             logger.info(f"Redirect URL: {redirect_url}")
-            
-            return {
-                "message": "If an account exists with this email, a password reset link has been sent."
-            }
-            
+
+            return _RESET_REQUESTED_RESPONSE
+
         except Exception as e:
             logger.error(f"Password reset request failed: {e}")
-            return {
-                "message": "If an account exists with this email, a password reset link has been sent."
-            }
+            return _RESET_REQUESTED_RESPONSE
     
     async def verify_and_reset_password(
         self, 
@@ -51,20 +60,31 @@ class PasswordResetService:
         """
         try:
             # Set the session with the access token from Supabase
-            session_response = self.client.auth.set_session(access_token, access_token)
-            
+            # (off-loop; both calls block on the Auth API)
+            session_response = await asyncio.to_thread(
+                self.client.auth.set_session, access_token, access_token
+            )
+
             if not session_response.user:
                 raise Exception("Invalid or expired reset link")
-            
+
             # Update the password
-            update_response = self.client.auth.update_user({
-                "password": new_password
-            })
+            update_response = await asyncio.to_thread(
+                self.client.auth.update_user, {
+                    "password": new_password
+                }
+            )
             
             if not update_response.user:
                 raise Exception("Failed to update password")
             
             logger.info(f"Password reset successful for user {update_response.user.id}")
+
+            # Drop any cached admin lookup for this user so stale
+            # metadata isn't served after the reset (local import to
+            # avoid a circular dependency with auth_service)
+            from app.services.auth_service import invalidate_user_cache
+            invalidate_user_cache(update_response.user.id)
             
             return {
                 "message": "Password has been reset successfully. You can now log in with your new password."
@@ -1,9 +1,26 @@
 from supabase import Client
 from typing import Dict, Any, List, Optional, Tuple
+from app.services.comparison_service import invalidate_comparison_cache
 import uuid
 from datetime import datetime
 
 
+# Rows per bulk upsert: keeps each PostgREST request comfortably under
+# its payload limits while staying a handful of round-trips total
+_UPSERT_BATCH = 500
+
+# Component names Syft sometimes emits that carry no information
+_INVALID_COMPONENT_NAMES = frozenset({'', 'none', 'unknown', 'null'})
+
+# Metadata-only application columns; the sbom_data/spdx_data blobs run
+# to megabytes and are only fetched when a caller asks for them
+_APP_METADATA_COLUMNS = (
+    "id, user_id, name, original_filename, file_size, file_hash, "
+    "storage_path, platform, status, component_count, sbom_format, "
+    "error_message, analyzed_at, created_at"
+)
+
+
 class SBOMService:
     
     def __init__(self, supabase_client: Client = None):
@@ -16,8 +33,8 @@ class SBOMService:
         """
         Get a fresh service client with SERVICE_ROLE_KEY.
         """
-        from app.core.database import get_supabase_client
-        return get_supabase_client()
+        from app.core.database import DatabaseClient
+        return DatabaseClient.get_client()
     
     async def store_application(
         self,
@@ -27,37 +44,64 @@ class SBOMService:
         file_hash: str,
         storage_path: str,
         platform: str = "unknown"
-    ) -> Tuple[str, bool]:
+    ) -> Tuple[str, bool, str]:
         """
         Store application record with complete user isolation.
+
+        Returns (app_id, is_new, status) - status is the existing row's
+        status for duplicates, so callers can retry failed uploads.
         """
         
         try:
-            # Check if THIS USER has already uploaded this exact file
-            print(f"Checking if user {user_id[:8]}... already uploaded: {file_hash[:16]}...")
-            
-            # Use service client to bypass RLS for read operations
-            from app.core.database import get_supabase_client
+            # Use service client to bypass RLS
+            from app.core.database import run_db
             service_client = self._get_service_client()
+            name = filename.rsplit('.', 1)[0] if '.' in filename else filename
+
+            # Single round-trip create-or-get: INSERT ... ON CONFLICT
+            # (user_id, file_hash) via RPC. Falls back to the two-query
+            # path when the function is not deployed yet.
+            try:
+                rpc_response = await run_db(service_client.rpc("upsert_application", {
+                    "p_user_id": user_id,
+                    "p_name": name,
+                    "p_original_filename": filename,
+                    "p_file_size": file_size,
+                    "p_file_hash": file_hash,
+                    "p_storage_path": storage_path,
+                    "p_platform": platform
+                }))
+                rows = rpc_response.data
+                row = rows[0] if isinstance(rows, list) and rows else rows
+                if row and row.get("id"):
+                    is_new = bool(row.get("is_new"))
+                    if is_new:
+                        print(f"New application created: {row['id']}")
+                    else:
+                        print(f"User already uploaded this file: {row.get('original_filename')}")
+                    return row["id"], is_new, row.get("status") or "processing"
+            except Exception as rpc_error:
+                print(f"upsert_application RPC unavailable, falling back: {rpc_error}")
+            
+            # Fallback: check if THIS USER has already uploaded this exact file
+            print(f"Checking if user {user_id[:8]}... already uploaded: {file_hash[:16]}...")
             
             # Query for this specific user + file_hash combination ONLY
-            existing_response = service_client.table("applications")\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .eq("file_hash", file_hash)\
-                .limit(1)\
-                .execute()
+            existing_response = await run_db(
+                service_client.table("applications")
+                .select("id, original_filename, status")
+                .eq("user_id", user_id)
+                .eq("file_hash", file_hash)
+                .limit(1)
+            )
             
-            # If THIS user already uploaded this file, reject it
+            # If THIS user already uploaded this file, reuse the record
             if existing_response.data and len(existing_response.data) > 0:
                 existing_app = existing_response.data[0]
                 print(f"User already uploaded this file: {existing_app['original_filename']}")
                 print(f"Existing application ID: {existing_app['id']}")
                 print(f"Status: {existing_app['status']}")
-                raise Exception(
-                    f"You have already uploaded this file: {existing_app['original_filename']}. "
-                    f"Application ID: {existing_app['id']}"
-                )
+                return existing_app["id"], False, existing_app.get("status") or "processing"
             
             # No duplicate found for this user - create new application record
             print(f"New file for user. Creating application record.")
@@ -66,7 +110,7 @@ class SBOMService:
             app_data = {
                 "id": app_id,
                 "user_id": user_id,
-                "name": filename.rsplit('.', 1)[0] if '.' in filename else filename,
+                "name": name,
                 "original_filename": filename,
                 "file_size": file_size,
                 "file_hash": file_hash,
@@ -78,10 +122,10 @@ class SBOMService:
             }
             
             # Insert using service_client to bypass RLS
-            response = service_client.table("applications").insert(app_data).execute()
+            response = await run_db(service_client.table("applications").insert(app_data))
             print(f"New application created: {app_id}")
-            
-            return app_id, True
+
+            return app_id, True, "processing"
             
         except Exception as e:
             error_msg = str(e)
@@ -105,8 +149,34 @@ class SBOMService:
         Store BOTH CycloneDX and SPDX formats in the application record.
         """
         
+        from app.core.database import run_db
+
         try:
-            # Store components and get the count
+            service_client = self._get_service_client()
+
+            # Single-transaction ingest: one RPC writes components,
+            # relationships and the application row together instead of
+            # several round-trips per component. Falls back to the
+            # Python loop when the function is not deployed yet. The
+            # payload carries both multi-MB SBOM blobs, so it must run
+            # off the event loop.
+            try:
+                rpc_response = await run_db(service_client.rpc("ingest_sbom", {
+                    "p_app_id": app_id,
+                    "p_user_id": user_id,
+                    "p_cyclonedx": cyclonedx_data,
+                    "p_spdx": spdx_data,
+                    "p_components": components,
+                    "p_platform": platform
+                }))
+                if rpc_response.data is not None:
+                    invalidate_comparison_cache(app_id)
+                    print(f"Stored {rpc_response.data} components for application {app_id} via ingest_sbom")
+                    return
+            except Exception as rpc_error:
+                print(f"ingest_sbom RPC unavailable, falling back: {rpc_error}")
+
+            # Fallback: store components and get the count
             component_count = await self._store_components(user_id, app_id, components)
             
             # Prepare update data with both SBOM formats
@@ -122,25 +192,27 @@ class SBOMService:
             }
             
             # Use service client to bypass RLS
-            from app.core.database import get_supabase_client
             service_client = self._get_service_client()
             
-            service_client.table("applications")\
-                .update(update_data)\
-                .eq("id", app_id)\
-                .execute()
-            
+            # The SBOM blobs are multi-MB; ask PostgREST not to echo the
+            # updated row back, which would double the transfer
+            await run_db(
+                service_client.table("applications")
+                .update(update_data, returning="minimal")
+                .eq("id", app_id)
+            )
+
+            invalidate_comparison_cache(app_id)
             print(f"Stored {component_count} components for application {app_id}")
             
         except Exception as e:
             # Update status to failed
-            from app.core.database import get_supabase_client
             service_client = self._get_service_client()
             
-            service_client.table("applications").update({
+            await run_db(service_client.table("applications").update({
                 "status": "failed",
                 "error_message": str(e)
-            }).eq("id", app_id).execute()
+            }).eq("id", app_id))
             
             raise Exception(f"Failed to update SBOM: {str(e)}")
     
@@ -157,154 +229,161 @@ class SBOMService:
         if not components:
             print("No components provided to store")
             return 0
-        
+
         print(f"Starting to store {len(components)} components for app {app_id}")
-        stored_count = 0
-        failed_count = 0
-        
+
         # Use service client for all database operations
-        from app.core.database import get_supabase_client
+        from app.core.database import run_db
         service_client = self._get_service_client()
-        
-        for idx, component in enumerate(components, 1):
-            try:
-                # Extract and validate component data
-                name = str(component.get('name', '')).strip()
-                version = str(component.get('version', 'unknown')).strip()
-                
-                # Skip invalid components
-                if not name or name.lower() in ['', 'none', 'unknown', 'null']:
-                    print(f"  [{idx}/{len(components)}] Skipped invalid component")
-                    failed_count += 1
-                    continue
-                
-                # Generate component ID (unique per user)
-                component_id = f"{user_id}:{name}@{version}"
-                
-                # Check if component exists for this user
-                existing_comp = service_client.table("components")\
-                    .select("id")\
-                    .eq("id", component_id)\
-                    .eq("user_id", user_id)\
-                    .execute()
-                
-                # Insert component if it doesn't exist for this user
-                component_insert_failed = False
-                if not existing_comp.data:
-                    component_data = {
-                        "id": component_id,
-                        "name": name,
-                        "version": version,
-                        "type": component.get("type", "library"),
-                        "license": component.get("license"),
-                        "purl": component.get("purl"),
-                        "cpe": component.get("cpe"),
-                        "description": component.get("description"),
-                        "supplier": component.get("supplier"),
-                        "author": component.get("author"),
-                        "homepage": component.get("homepage"),
-                        "repository_url": component.get("repository_url"),
-                        "user_id": user_id,
-                        "created_at": datetime.utcnow().isoformat()
-                    }
-                    
-                    try:
-                        service_client.table("components").insert(component_data).execute()
-                        print(f"  [{idx}/{len(components)}] Component inserted: {name}@{version}")
-                    except Exception as comp_err:
-                        error_msg = str(comp_err).lower()
-                        # Duplicate is OK - component was inserted by another process
-                        if 'duplicate' in error_msg or 'unique' in error_msg:
-                            print(f"  [{idx}/{len(components)}] Component already exists (duplicate): {name}@{version}")
-                        else:
-                            # Real error - log it and skip this component
-                            print(f"  [{idx}/{len(components)}] Component insert FAILED: {name}@{version}")
-                            print(f"       Error: {str(comp_err)}")
-                            component_insert_failed = True
-                            failed_count += 1
-                            continue
-                
-                # IMPORTANT: Only create relationship if component exists
-                # Verify component exists before creating relationship
-                verify_comp = service_client.table("components")\
-                    .select("id")\
-                    .eq("id", component_id)\
-                    .eq("user_id", user_id)\
-                    .execute()
-                
-                if not verify_comp.data:
-                    print(f"  [{idx}/{len(components)}] Component doesn't exist, skipping relationship: {name}@{version}")
-                    failed_count += 1
-                    continue
-                
-                # Check if relationship already exists
-                existing_rel = service_client.table("application_components")\
-                    .select("id")\
-                    .eq("application_id", app_id)\
-                    .eq("component_id", component_id)\
-                    .eq("user_id", user_id)\
-                    .execute()
-                
-                # Only insert if relationship doesn't exist
-                if not existing_rel.data:
-                    relationship_id = str(uuid.uuid4())
-                    relationship = {
-                        "id": relationship_id,
-                        "application_id": app_id,
-                        "component_id": component_id,
-                        "user_id": user_id,
-                        "relationship_type": component.get("relationship_type", "direct"),
-                        "depth": component.get("depth", 0),
-                        "confidence": component.get("confidence", 1.0),
-                        "detected_by": component.get("detected_by", "syft"),
-                        "created_at": datetime.utcnow().isoformat()
-                    }
-                    
-                    result = service_client.table("application_components")\
-                        .insert(relationship)\
-                        .execute()
-                    
-                    if result.data:
-                        stored_count += 1
-                        # Show progress every 50 components
-                        if idx % 50 == 0:
-                            print(f"  Progress: {idx}/{len(components)} processed, {stored_count} stored")
-                else:
-                    # Relationship already exists, count as stored
-                    stored_count += 1
-                    
-            except Exception as e:
-                failed_count += 1
-                error_msg = str(e)
-                component_name = component.get('name', 'unknown')
-                print(f"  [{idx}/{len(components)}] Error: {component_name}: {error_msg}")
+
+        # Single pass: validate, dedupe by component id, and build the
+        # rows for both tables. All the old per-component SELECT/INSERT/
+        # verify round-trips collapse into two bulk upserts below.
+        now = datetime.utcnow().isoformat()
+        seen_ids = set()
+        comp_rows = []
+        rel_rows = []
+        skipped_count = 0
+
+        for component in components:
+            name = str(component.get('name', '')).strip()
+            version = str(component.get('version', 'unknown')).strip()
+
+            # Skip invalid components
+            if name.lower() in _INVALID_COMPONENT_NAMES:
+                skipped_count += 1
                 continue
-        
+
+            # Component ID is unique per user
+            component_id = f"{user_id}:{name}@{version}"
+            if component_id in seen_ids:
+                continue
+            seen_ids.add(component_id)
+
+            comp_rows.append({
+                "id": component_id,
+                "name": name,
+                "version": version,
+                "type": component.get("type", "library"),
+                "license": component.get("license"),
+                "purl": component.get("purl"),
+                "cpe": component.get("cpe"),
+                "description": component.get("description"),
+                "supplier": component.get("supplier"),
+                "author": component.get("author"),
+                "homepage": component.get("homepage"),
+                "repository_url": component.get("repository_url"),
+                "user_id": user_id,
+                "created_at": now
+            })
+            rel_rows.append({
+                "application_id": app_id,
+                "component_id": component_id,
+                "user_id": user_id,
+                "relationship_type": component.get("relationship_type", "direct"),
+                "depth": component.get("depth", 0),
+                "confidence": component.get("confidence", 1.0),
+                "detected_by": component.get("detected_by", "syft"),
+                "created_at": now
+            })
+
+        if not comp_rows:
+            print("No valid components to store")
+            return 0
+
+        # Existing rows win the conflict (ignore_duplicates=True mirrors
+        # the old duplicate-tolerant inserts); ordering matters so the
+        # relationship FKs resolve. Batched, with Prefer: return=minimal
+        # so Supabase doesn't echo every row back.
+        for start in range(0, len(comp_rows), _UPSERT_BATCH):
+            await run_db(
+                service_client.table("components")
+                .upsert(
+                    comp_rows[start:start + _UPSERT_BATCH],
+                    on_conflict="id",
+                    ignore_duplicates=True,
+                    returning="minimal"
+                )
+            )
+        async def _upsert_relationships():
+            for start in range(0, len(rel_rows), _UPSERT_BATCH):
+                await run_db(
+                    service_client.table("application_components")
+                    .upsert(
+                        rel_rows[start:start + _UPSERT_BATCH],
+                        on_conflict="application_id,component_id,user_id",
+                        ignore_duplicates=True,
+                        returning="minimal"
+                    )
+                )
+
+        async def _insert_relationships():
+            # Pre-008/010 schema: no unique index on the composite key,
+            # so any ON CONFLICT target errors out (42P10). Fall back to
+            # the baseline's plain inserts - the generated row ids
+            # satisfy the legacy primary key.
+            for start in range(0, len(rel_rows), _UPSERT_BATCH):
+                await run_db(
+                    service_client.table("application_components")
+                    .insert(
+                        rel_rows[start:start + _UPSERT_BATCH],
+                        returning="minimal"
+                    )
+                )
+
+        # Relationships are keyed by (application_id, component_id,
+        # user_id) since migration 010; no per-row uuid needed. On the
+        # legacy schema (id column still NOT NULL) the first attempt
+        # fails, so retry once with generated ids - the ignore_duplicates
+        # upserts make the retry idempotent. If that fails too, the
+        # composite unique index itself is missing and plain inserts are
+        # the only option.
+        try:
+            await _upsert_relationships()
+        except Exception as schema_error:
+            print(f"Composite-key upsert failed, retrying with row ids: {schema_error}")
+            for row in rel_rows:
+                row["id"] = str(uuid.uuid4())
+            try:
+                await _upsert_relationships()
+            except Exception as constraint_error:
+                print(f"ON CONFLICT target unavailable, falling back to plain inserts: {constraint_error}")
+                await _insert_relationships()
+
+        stored_count = len(rel_rows)
+
         # Final summary
         print(f"\nStorage Summary for app {app_id}:")
         print(f"  Successfully stored: {stored_count}/{len(components)}")
-        print(f"  Failed/Skipped: {failed_count}/{len(components)}")
-        
-        if stored_count == 0 and len(components) > 0:
-            print(f"  WARNING: No components were stored! Check errors above.")
-        
+        print(f"  Failed/Skipped: {skipped_count}/{len(components)}")
+
         return stored_count
     
-    async def get_application(self, user_id: str, app_id: str) -> Optional[Dict[str, Any]]:
+    async def get_application(
+        self,
+        user_id: str,
+        app_id: str,
+        include_sbom: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Get application details for a specific user.
+
+        Metadata only by default; pass include_sbom=True when the SBOM
+        blobs are actually needed.
         """
-        
+
         try:
-            from app.core.database import get_supabase_client
+            from app.core.database import run_db
             service_client = self._get_service_client()
-            
+
             # Query with user_id filter to enforce isolation
-            response = service_client.table("applications")\
-                .select("*")\
-                .eq("id", app_id)\
-                .eq("user_id", user_id)\
-                .execute()
+            columns = "*" if include_sbom else _APP_METADATA_COLUMNS
+            response = await run_db(
+                service_client.table("applications")
+                .select(columns)
+                .eq("id", app_id)
+                .eq("user_id", user_id)
+            )
             
             if response.data and len(response.data) > 0:
                 return response.data[0]
@@ -320,33 +399,51 @@ class SBOMService:
         Delete application and all associated data.
         """
         
+        from app.core.database import run_db
+        service_client = self._get_service_client()
+
+        # Single round-trip: the FK from application_components cascades
+        # (migration 009), and the deleted rows echoed back double as the
+        # ownership/existence check - no pre-check SELECT needed.
         try:
-            from app.core.database import get_supabase_client
-            service_client = self._get_service_client()
-            
-            # First verify the application belongs to this user
-            app = await self.get_application(user_id, app_id)
-            if not app:
+            response = await run_db(
+                service_client.table("applications")
+                .delete()
+                .eq("id", app_id)
+                .eq("user_id", user_id)
+            )
+            if not response.data:
                 print(f"Application {app_id} not found or not authorized for user {user_id}")
                 return False
-            
-            # Delete application_components relationships
-            service_client.table("application_components")\
-                .delete()\
-                .eq("application_id", app_id)\
-                .eq("user_id", user_id)\
-                .execute()
-            
-            # Delete the application record
-            service_client.table("applications")\
-                .delete()\
-                .eq("id", app_id)\
-                .eq("user_id", user_id)\
-                .execute()
-            
+            invalidate_comparison_cache(app_id)
             print(f"Deleted application {app_id} for user {user_id}")
             return True
-            
+        except Exception as fk_error:
+            # Cascade FK not deployed yet (FK violation) - fall back to
+            # deleting the relationships first
+            print(f"Cascade delete unavailable, falling back: {fk_error}")
+
+        try:
+            await run_db(
+                service_client.table("application_components")
+                .delete()
+                .eq("application_id", app_id)
+                .eq("user_id", user_id)
+            )
+            response = await run_db(
+                service_client.table("applications")
+                .delete()
+                .eq("id", app_id)
+                .eq("user_id", user_id)
+            )
+            if not response.data:
+                print(f"Application {app_id} not found or not authorized for user {user_id}")
+                return False
+
+            invalidate_comparison_cache(app_id)
+            print(f"Deleted application {app_id} for user {user_id}")
+            return True
+
         except Exception as e:
             print(f"Error deleting application: {str(e)}")
             return False
@@ -364,15 +461,16 @@ class SBOMService:
         """
         
         try:
-            from app.core.database import get_supabase_client
+            from app.core.database import run_db
             service_client = self._get_service_client()
-            
+
             # Calculate offset
             offset = (page - 1) * limit
             
-            # Build query with user filter
+            # Build query with user filter (estimated count: exact for
+            # small result sets, planner estimate beyond max-rows)
             query = service_client.table("applications")\
-                .select("*", count="exact")\
+                .select("*", count="estimated")\
                 .eq("user_id", user_id)
             
             # Apply filters if provided
@@ -385,8 +483,8 @@ class SBOMService:
             query = query.order("created_at", desc=True)\
                 .range(offset, offset + limit - 1)
             
-            response = query.execute()
-            
+            response = await run_db(query)
+
             return {
                 "applications": response.data,
                 "total": response.count,
@@ -1,5 +1,6 @@
 from supabase import Client
 from app.core.config import settings
+import asyncio
 import hashlib
 from typing import Optional
 import httpx
@@ -26,30 +27,42 @@ class StorageService:
     def calculate_file_hash(self, file_content: bytes) -> str:
         """Calculate SHA256 hash of file content."""
         return hashlib.sha256(file_content).hexdigest()
+
+    def object_path(self, filename: str, user_id: str, file_hash: str) -> str:
+        """
+        Deterministic storage key for a user's file (content-addressed),
+        computable before any upload happens.
+        """
+        return f"{user_id}/{file_hash}_{filename}"
     
     async def upload_file(
         self, 
-        file_content: bytes, 
+        local_path: str, 
         filename: str, 
-        user_id: str
+        user_id: str,
+        file_hash: str,
+        file_size: int
     ) -> dict:
         """
-        Upload file to Supabase Storage with extended timeout.
+        Upload a file already streamed to disk to Supabase Storage.
+
+        Takes the temp file path plus the hash/size computed during the
+        initial stream, so the file is never re-read into memory here -
+        the storage client streams it from disk.
         """
         try:
-            print(f"  Storage: Calculating file hash...")
-            file_hash = self.calculate_file_hash(file_content)
-            
             # Organize files by user: uploads/{user_id}/{file_hash}_{filename}
-            file_path = f"{user_id}/{file_hash}_{filename}"
+            file_path = self.object_path(filename, user_id, file_hash)
             
-            print(f"  Storage: Uploading {len(file_content)/(1024*1024):.2f}MB to {file_path}...")
+            print(f"  Storage: Uploading {file_size/(1024*1024):.2f}MB to {file_path}...")
             
             # Just catch duplicate and ignore - file already in storage is fine
             try:
-                response = self.client.storage.from_(self.bucket).upload(
+                # Run the blocking storage call off the event loop
+                response = await asyncio.to_thread(
+                    self.client.storage.from_(self.bucket).upload,
                     path=file_path,
-                    file=file_content,
+                    file=local_path,
                     file_options={"content-type": "application/octet-stream"}
                 )
                 print(f"  Storage: Upload complete!")
@@ -63,7 +76,7 @@ class StorageService:
             return {
                 "file_path": file_path,
                 "file_hash": file_hash,
-                "file_size": len(file_content),
+                "file_size": file_size,
                 "storage_path": f"{self.bucket}/{file_path}"
             }
             
@@ -74,18 +87,20 @@ class StorageService:
             # Provide helpful error messages
             if "timeout" in error_msg.lower():
                 raise Exception(
-                    f"File upload timed out. File size: {len(file_content)/(1024*1024):.1f}MB. "
+                    f"File upload timed out. File size: {file_size/(1024*1024):.1f}MB. "
                     f"Consider using a faster connection."
                 )
             elif "size" in error_msg.lower():
-                raise Exception(f"File too large: {len(file_content)/(1024*1024):.1f}MB")
+                raise Exception(f"File too large: {file_size/(1024*1024):.1f}MB")
             else:
                 raise Exception(f"File upload failed: {error_msg}")
     
     async def download_file(self, file_path: str) -> bytes:
         """Download file from Supabase Storage."""
         try:
-            response = self.client.storage.from_(self.bucket).download(file_path)
+            response = await asyncio.to_thread(
+                self.client.storage.from_(self.bucket).download, file_path
+            )
             return response
         except Exception as e:
             raise Exception(f"File download failed: {str(e)}")
@@ -93,7 +108,9 @@ class StorageService:
     async def delete_file(self, file_path: str) -> bool:
         """Delete file from Supabase Storage."""
         try:
-            self.client.storage.from_(self.bucket).remove([file_path])
+            await asyncio.to_thread(
+                self.client.storage.from_(self.bucket).remove, [file_path]
+            )
             return True
         except Exception as e:
             print(f"File deletion failed: {str(e)}")
@@ -47,43 +47,45 @@ class SyftService:
         except Exception as e:
             raise Exception(f"SBOM generation failed: {str(e)}")
     
-    def generate_sbom_sync(self, file_path: str) -> tuple:
+    def _generate_format_sync(self, file_path: str, output_format: str) -> Dict[str, Any]:
         """
-        Synchronous version for thread pool execution.
+        Run a single Syft scan for one output format (blocking).
         """
-        import subprocess
-        import tempfile
-        import json
-        
-        # Generate CycloneDX
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as cyclone_tmp:
-            cyclone_path = cyclone_tmp.name
-        
-        subprocess.run([
-            'syft', 'scan', file_path,
-            '-o', 'cyclonedx-json',
-            '--file', cyclone_path
-        ], check=True, capture_output=True)
-        
-        with open(cyclone_path, 'r') as f:
-            cyclonedx_data = json.load(f)
-        os.unlink(cyclone_path)
-        
-        # Generate SPDX
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as spdx_tmp:
-            spdx_path = spdx_tmp.name
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.json') as tmp:
+            output_path = tmp.name
         
         subprocess.run([
-            'syft', 'scan', file_path,
-            '-o', 'spdx-json',
-            '--file', spdx_path
+            self.syft_binary, 'scan', file_path,
+            '-o', output_format,
+            '--file', output_path
         ], check=True, capture_output=True)
         
-        with open(spdx_path, 'r') as f:
-            spdx_data = json.load(f)
-        os.unlink(spdx_path)
+        with open(output_path, 'r') as f:
+            sbom_data = json.load(f)
+        os.unlink(output_path)
         
-        return cyclonedx_data, spdx_data
+        return sbom_data
+    
+    def generate_cyclonedx_sync(self, file_path: str) -> Dict[str, Any]:
+        """Generate a CycloneDX SBOM (blocking, for executor use)."""
+        return self._generate_format_sync(file_path, 'cyclonedx-json')
+    
+    def generate_spdx_sync(self, file_path: str) -> Dict[str, Any]:
+        """Generate an SPDX SBOM (blocking, for executor use)."""
+        return self._generate_format_sync(file_path, 'spdx-json')
+    
+    def generate_sbom_sync(self, file_path: str) -> tuple:
+        """
+        Synchronous version for thread pool execution.
+
+        Kept for callers that want both formats from one worker thread;
+        the per-format methods above allow running the two Syft scans in
+        parallel since the subprocess calls release the GIL.
+        """
+        return (
+            self.generate_cyclonedx_sync(file_path),
+            self.generate_spdx_sync(file_path)
+        )
     
     async def _run_syft(self, file_path: str, output_format: str) -> Dict[str, Any]:
         """Run Syft with specified format."""
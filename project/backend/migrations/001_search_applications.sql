@@ -0,0 +1,67 @@
+-- Full-text + trigram search support for GET /applications/search.
+-- Run against the Supabase project database (SQL editor or supabase CLI).
+
+create extension if not exists pg_trgm;
+
+-- Generated tsvector over the searchable fields, kept up to date by Postgres.
+alter table applications
+    add column if not exists search_vec tsvector
+    generated always as (
+        to_tsvector(
+            'simple',
+            coalesce(name, '') || ' ' ||
+            coalesce(version, '') || ' ' ||
+            coalesce(platform, '') || ' ' ||
+            coalesce(manufacturer, '') || ' ' ||
+            coalesce(supplier, '')
+        )
+    ) stored;
+
+create index if not exists idx_applications_search_vec
+    on applications using gin (search_vec);
+
+-- Trigram index on name for typo-tolerant matching.
+create index if not exists idx_applications_name_trgm
+    on applications using gin (name gin_trgm_ops);
+
+-- Indexed top-K search: full-text match OR trigram similarity on name,
+-- ranked server-side so only `p_limit` rows ever leave the database.
+create or replace function search_applications(
+    p_user_id uuid,
+    p_query text,
+    p_limit integer default 10
+)
+returns table (
+    id uuid,
+    name text,
+    version text,
+    platform text,
+    status text,
+    component_count integer,
+    file_size bigint,
+    created_at timestamptz,
+    analyzed_at timestamptz,
+    binary_type text,
+    os text,
+    manufacturer text,
+    supplier text,
+    sbom_format text,
+    similarity_score numeric
+)
+language sql
+stable
+as $$
+    select a.id, a.name, a.version, a.platform, a.status, a.component_count,
+           a.file_size, a.created_at, a.analyzed_at, a.binary_type, a.os,
+           a.manufacturer, a.supplier, a.sbom_format,
+           round(least(100, greatest(
+               ts_rank_cd(a.search_vec, plainto_tsquery('simple', p_query)) * 100,
+               similarity(a.name, p_query) * 100
+           ))::numeric, 2) as similarity_score
+    from applications a
+    where a.user_id = p_user_id
+      and (a.search_vec @@ plainto_tsquery('simple', p_query)
+           or a.name % p_query)
+    order by similarity_score desc
+    limit p_limit;
+$$;
@@ -0,0 +1,19 @@
+-- Composite indexes backing the hot query shapes in the applications and
+-- upload endpoints. Run against the Supabase project database.
+
+-- Ownership lookups: .eq("id", ...).eq("user_id", ...)
+create index if not exists idx_applications_user_id_id
+    on applications (user_id, id);
+
+-- Listing: .eq("user_id", ...) ordered by created_at desc, id desc
+-- (serves both the keyset and the legacy OFFSET pagination)
+create index if not exists idx_applications_user_created_id
+    on applications (user_id, created_at desc, id desc);
+
+-- Duplicate check on upload: .eq("user_id", ...).eq("file_hash", ...)
+create index if not exists idx_applications_user_file_hash
+    on applications (user_id, file_hash);
+
+-- Component joins and cascading deletes by application
+create index if not exists idx_application_components_app_id
+    on application_components (application_id);
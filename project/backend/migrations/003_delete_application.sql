@@ -0,0 +1,28 @@
+-- Transactional single-round-trip delete for DELETE /applications/{id}.
+-- Replaces three sequential PostgREST calls (ownership select, component
+-- delete, application delete) with one RPC.
+
+create or replace function delete_application(
+    p_app_id uuid,
+    p_user_id uuid
+)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_storage_path text;
+begin
+    select storage_path into v_storage_path
+    from applications
+    where id = p_app_id and user_id = p_user_id;
+
+    if not found then
+        return jsonb_build_object('found', false);
+    end if;
+
+    delete from application_components where application_id = p_app_id;
+    delete from applications where id = p_app_id;
+
+    return jsonb_build_object('found', true, 'storage_path', v_storage_path);
+end;
+$$;
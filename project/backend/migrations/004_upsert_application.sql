@@ -0,0 +1,45 @@
+-- Single round-trip create-or-get for POST /upload.
+-- Replaces the SELECT-by-hash + INSERT pair in SBOMService.store_application
+-- with one INSERT ... ON CONFLICT, and makes the per-user duplicate check
+-- race-free under concurrent uploads of the same file.
+
+-- Idempotent like the other migrations: ADD CONSTRAINT has no
+-- IF NOT EXISTS form, so swallow the duplicate error on re-runs
+do $$
+begin
+    alter table applications
+        add constraint applications_user_file_hash_key unique (user_id, file_hash);
+exception
+    when duplicate_table or duplicate_object then null;
+end;
+$$;
+
+create or replace function upsert_application(
+    p_user_id uuid,
+    p_name text,
+    p_original_filename text,
+    p_file_size bigint,
+    p_file_hash text,
+    p_storage_path text,
+    p_platform text
+)
+returns table (id uuid, is_new boolean, original_filename text, status text)
+language sql
+as $$
+    insert into applications (
+        id, user_id, name, original_filename, file_size, file_hash,
+        storage_path, platform, status, component_count, created_at
+    )
+    values (
+        gen_random_uuid(), p_user_id, p_name, p_original_filename,
+        p_file_size, p_file_hash, p_storage_path, p_platform,
+        'processing', 0, now()
+    )
+    on conflict (user_id, file_hash) do update
+        -- no-op touch so the existing row is still returned
+        set file_hash = excluded.file_hash
+    returning applications.id,
+              (xmax = 0) as is_new,
+              applications.original_filename,
+              applications.status;
+$$;
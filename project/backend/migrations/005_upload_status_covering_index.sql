@@ -0,0 +1,15 @@
+-- Covering index for GET /upload/status/{app_id}, which the frontend
+-- polls repeatedly while background SBOM processing runs. Includes the
+-- columns the endpoint selects so the poll is an index-only scan -
+-- except error_message: it is unbounded text and a long message would
+-- push the index tuple past the B-tree size limit, failing the very
+-- UPDATE that records the error. Failed rows are rare enough that the
+-- heap fetch for it doesn't matter.
+--
+-- No CONCURRENTLY: these migrations run via the Supabase SQL editor,
+-- which wraps each run in a transaction, and CREATE INDEX CONCURRENTLY
+-- cannot run inside a transaction block.
+
+create index if not exists idx_applications_status_covering
+    on applications (id, user_id)
+    include (name, status, component_count, analyzed_at, platform);
@@ -0,0 +1,45 @@
+-- One-round-trip fetch for the comparison page: both application rows
+-- plus their component lists, joined server-side where the indexes
+-- live, instead of three separate PostgREST queries.
+
+create or replace function get_comparison_dataset(
+    p_app1 uuid,
+    p_app2 uuid,
+    p_user_id uuid
+)
+returns jsonb
+language sql
+stable
+as $$
+select jsonb_build_object(
+    'apps',
+    (
+        -- drop the multi-MB SBOM blobs; the comparison only needs metadata
+        select coalesce(
+            jsonb_object_agg(a.id, to_jsonb(a) - 'sbom_data' - 'spdx_data'),
+            '{}'::jsonb
+        )
+        from applications a
+        where a.id in (p_app1, p_app2)
+          and a.user_id = p_user_id
+    ),
+    'components',
+    (
+        select coalesce(jsonb_object_agg(app_id, comps), '{}'::jsonb)
+        from (
+            select ac.application_id as app_id,
+                   jsonb_agg(jsonb_build_object(
+                       'name', c.name,
+                       'version', c.version,
+                       'type', c.type,
+                       'license', c.license
+                   )) as comps
+            from application_components ac
+            join components c on c.id = ac.component_id
+            where ac.application_id in (p_app1, p_app2)
+              and ac.user_id = p_user_id
+            group by ac.application_id
+        ) s
+    )
+);
+$$;
@@ -0,0 +1,5 @@
+-- Unique key needed for the bulk ON CONFLICT upsert of relationships in
+-- _store_components (components already conflict on their primary key).
+
+create unique index if not exists idx_application_components_app_comp_user
+    on application_components (application_id, component_id, user_id);
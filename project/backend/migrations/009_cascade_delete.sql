@@ -0,0 +1,10 @@
+-- Let the database cascade relationship rows when an application is
+-- deleted, so callers need one DELETE instead of two plus a pre-check.
+
+alter table application_components
+    drop constraint if exists application_components_application_id_fkey;
+
+alter table application_components
+    add constraint application_components_application_id_fkey
+    foreign key (application_id) references applications (id)
+    on delete cascade;
@@ -0,0 +1,99 @@
+-- application_components rows are already uniquely identified by
+-- (application_id, component_id, user_id); the surrogate uuid id forced
+-- a random B-tree insert per row and an os.urandom call in Python.
+-- Promote the natural key to primary key and drop the uuid column.
+
+alter table application_components
+    drop constraint if exists application_components_pkey;
+
+alter table application_components
+    drop column if exists id;
+
+alter table application_components
+    add primary key (application_id, component_id, user_id);
+
+-- The primary key covers the conflict target, so the helper index from
+-- migration 008 is redundant now
+drop index if exists idx_application_components_app_comp_user;
+
+-- Recreate ingest_sbom (006) without the dropped id column
+create or replace function ingest_sbom(
+    p_app_id uuid,
+    p_user_id uuid,
+    p_cyclonedx jsonb,
+    p_spdx jsonb,
+    p_components jsonb,
+    p_platform text
+)
+returns integer
+language plpgsql
+as $$
+declare
+    v_stored integer;
+begin
+    with raw as (
+        select
+            trim(coalesce(c.name, ''))               as name,
+            trim(coalesce(c.version, 'unknown'))     as version,
+            coalesce(c.type, 'library')              as type,
+            c.license, c.purl, c.cpe, c.description,
+            c.supplier, c.author, c.homepage, c.repository_url,
+            coalesce(c.relationship_type, 'direct')  as relationship_type,
+            coalesce(c.depth, 0)                     as depth,
+            coalesce(c.confidence, 1.0)              as confidence,
+            coalesce(c.detected_by, 'syft')          as detected_by
+        from jsonb_to_recordset(p_components) as c(
+            name text, version text, type text, license text,
+            purl text, cpe text, description text, supplier text,
+            author text, homepage text, repository_url text,
+            relationship_type text, depth integer,
+            confidence numeric, detected_by text
+        )
+        where trim(coalesce(c.name, '')) <> ''
+          and lower(trim(coalesce(c.name, ''))) not in ('none', 'unknown', 'null')
+    ),
+    comps as (
+        -- component id scheme matches the Python path: user_id:name@version
+        select distinct on (id) *
+        from (
+            select p_user_id::text || ':' || name || '@' || version as id, raw.*
+            from raw
+        ) t
+    ),
+    ins_components as (
+        insert into components (
+            id, name, version, type, license, purl, cpe, description,
+            supplier, author, homepage, repository_url, user_id, created_at
+        )
+        select id, name, version, type, license, purl, cpe, description,
+               supplier, author, homepage, repository_url, p_user_id, now()
+        from comps
+        on conflict (id) do nothing
+    )
+    insert into application_components (
+        application_id, component_id, user_id, relationship_type,
+        depth, confidence, detected_by, created_at
+    )
+    select p_app_id, id, p_user_id, relationship_type,
+           depth, confidence, detected_by, now()
+    from comps
+    on conflict do nothing;
+
+    select count(*) into v_stored
+    from application_components
+    where application_id = p_app_id and user_id = p_user_id;
+
+    update applications set
+        sbom_data = p_cyclonedx,
+        spdx_data = p_spdx,
+        sbom_format = 'cyclonedx',
+        component_count = v_stored,
+        platform = p_platform,
+        status = 'completed',
+        analyzed_at = now(),
+        error_message = null
+    where id = p_app_id and user_id = p_user_id;
+
+    return v_stored;
+end;
+$$;